@@ -0,0 +1,104 @@
+"""
+Execution time benchmark for tasks of module 1.
+For every task it compares the original function with its batch, streaming, vectorized or parallel version
+on large generated inputs (NumPy versions are skipped if NumPy is not installed).
+
+Run from repository root:
+    python -m practice.module_1_python_part_1.benchmark_tasks
+"""
+import io
+import os
+import tempfile
+from time import perf_counter
+from practice.module_1_python_part_1.task1 import delete_from_list, delete_all_from_list, delete_all_from_array
+from practice.module_1_python_part_1.task2 import set_to_dict, set_to_dict_batch
+from practice.module_1_python_part_1.task3 import build_from_unique_words, build_from_unique_words_stream
+from practice.module_1_python_part_1.task4 import (calculate_power_with_difference,
+                                                   calculate_power_with_difference_vectorized,
+                                                   iter_power_with_difference)
+from practice.module_1_python_part_1.task5 import remove_duplicated_words, remove_duplicated_words_stream
+from practice.module_1_python_part_1.task6 import get_min_max, get_min_max_mmap
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def measure(name, func, *args, **kwargs):
+    """Printing execution time of one call"""
+    time_start = perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{name} execution time: {perf_counter() - time_start}")
+    return result
+
+
+def benchmark_task1(size=10_000_000):
+    """10M elements list with 10% of elements to delete"""
+    measure(f"delete_all_from_list ({size} elements)", delete_all_from_list, [i % 10 for i in range(size)], {3})
+    if np is not None:
+        measure(f"delete_all_from_array ({size} elements)", delete_all_from_array, np.arange(size) % 10, [3])
+    measure(f"delete_from_list ({size // 100} elements)", delete_from_list, [i % 10 for i in range(size // 100)], 3)
+
+
+def benchmark_task2(shards_number=100_000):
+    """100K shards with 100 metrics from 1000 keys each"""
+    shards = [{f"metric_{(i * 7 + j) % 1000}": (i * j) % 997 for j in range(100)} for i in range(shards_number)]
+
+    def set_shards(dictionary):
+        for shard in shards:
+            set_to_dict(dictionary, **shard)
+        return dictionary
+
+    expected = measure(f"set_to_dict ({len(shards)} shards)", set_shards, {})
+    assert measure(f"set_to_dict_batch ({len(shards)} shards)", set_to_dict_batch, {}, shards) == expected
+    assert measure(f"set_to_dict_batch ({len(shards)} shards, 4 workers)", set_to_dict_batch, {}, shards,
+                   workers=4) == expected
+
+
+def benchmark_task3(lines_number=10_000):
+    """10K long lines"""
+    lines = [" ".join(f"word{j % 500}" for j in range(i, i + 5000)) for i in range(lines_number)]
+    measure(f"build_from_unique_words ({len(lines)} lines)", build_from_unique_words, *lines, word_number=3)
+    measure(f"build_from_unique_words_stream ({len(lines)} lines)", build_from_unique_words_stream, lines,
+            word_number=3)
+
+
+def benchmark_task4(size=10_000_000):
+    """10M integers"""
+    ints = list(range(-size // 2, size // 2))
+    measure(f"calculate_power_with_difference ({len(ints)} integers)", calculate_power_with_difference, ints)
+    measure(f"calculate_power_with_difference_vectorized ({len(ints)} integers)",
+            calculate_power_with_difference_vectorized, ints)
+    measure(f"iter_power_with_difference ({len(ints)} integers)",
+            lambda: sum(1 for _ in iter_power_with_difference(iter(ints))))
+
+
+def benchmark_task5(words_number=10_000_000):
+    """10M words line"""
+    line = " ".join(f"word{i % 100_000}" for i in range(words_number))
+    measure(f"remove_duplicated_words ({words_number} words)", remove_duplicated_words, line)
+    measure(f"remove_duplicated_words_stream ({words_number} words)", remove_duplicated_words_stream,
+            io.StringIO(line))
+    line = line[:len(line) // 10]
+    measure(f"remove_duplicated_words_stream ({words_number // 10} words, approximate)",
+            remove_duplicated_words_stream, io.StringIO(line), approximate=True, capacity=100_000)
+
+
+def benchmark_task6(lines_number=10_000_000):
+    """10M lines file"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        benchmark_file = os.path.join(tmp_dir, "task6_benchmark.txt")
+        with open(benchmark_file, "w") as f:
+            f.writelines(f"{(i * 7919) % 1_000_003 - 500_000}\n" for i in range(lines_number))
+        measure(f"get_min_max ({lines_number} lines)", get_min_max, benchmark_file)
+        measure(f"get_min_max_mmap ({lines_number} lines)", get_min_max_mmap, benchmark_file)
+
+
+if __name__ == "__main__":
+    benchmark_task1()
+    benchmark_task2()
+    benchmark_task3()
+    benchmark_task4()
+    benchmark_task5()
+    benchmark_task6()
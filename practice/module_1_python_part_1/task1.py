@@ -11,7 +11,12 @@ Examples:
     >>> delete_from_list([], 'b')
     []
 """
-from typing import List, Any
+from typing import List, Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def delete_from_list(list_to_clean: List, item_to_delete: Any) -> List:
@@ -22,8 +27,36 @@ def delete_from_list(list_to_clean: List, item_to_delete: Any) -> List:
         list_to_clean.pop(i)
     return list_to_clean
 
+
+def delete_all_from_list(list_to_clean: List, items_to_delete: Iterable) -> List:
+    """Deletes all given items from list in one pass (the same list object is returned)"""
+    items_to_delete = list(items_to_delete)
+    if not items_to_delete or not list_to_clean:
+        return list_to_clean
+    try:
+        items = set(items_to_delete)
+        kept = [x for x in list_to_clean if x not in items]
+    except TypeError:
+        # Unhashable items are compared one by one
+        kept = [x for x in list_to_clean if not any(x == item for item in items_to_delete)]
+    if len(kept) != len(list_to_clean):
+        list_to_clean[:] = kept
+    return list_to_clean
+
+
+def delete_all_from_array(array_to_clean, items_to_delete: Iterable):
+    """Deletes all given items from numeric NumPy array with boolean mask (new array is returned)
+
+    Without NumPy any sequence is cleaned in Python and new list is returned.
+    """
+    if np is None:
+        return delete_all_from_list(list(array_to_clean), items_to_delete)
+    return array_to_clean[~np.isin(array_to_clean, list(items_to_delete))]
+
+
 if __name__ == '__main__':
     print(delete_from_list([1, 2, 3, 4, 3], 3))
     print(delete_from_list(['a', 'b', 'c', 'b', 'd'], 'b'))
     print(delete_from_list([1, 2, 3], 'b'))
-    print(delete_from_list([], 'b'))
\ No newline at end of file
+    print(delete_from_list([], 'b'))
+    print(delete_all_from_list([1, 2, 3, 4, 3], {3, 4}))
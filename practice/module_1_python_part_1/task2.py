@@ -9,7 +9,17 @@ Examples:
     >>> set_to_dict({'a': 5})
     {'a': 5}
 """
-from typing import Dict
+from typing import Dict, Iterable, Mapping, Sequence, List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MISSING = object()
+PARALLEL_MAPPINGS_NUMBER = 10_000 # fold mappings in process pool only if there are at least so many of them
 
 
 def set_to_dict(dict_to_update: Dict[str, int], **items_to_set) -> Dict:
@@ -18,7 +28,77 @@ def set_to_dict(dict_to_update: Dict[str, int], **items_to_set) -> Dict:
             dict_to_update[i] = items_to_set[i]
     return dict_to_update
 
+
+def merge_max_pairs(dict_to_update: Dict, pairs: Iterable) -> Dict:
+    """Merges (key, value) pairs like set_to_dict calls do"""
+    # One lookup per key: existing (hot) keys are compared, new keys are added
+    get = dict_to_update.get
+    for key, value in pairs:
+        current = get(key, MISSING)
+        if current is MISSING or value > current:
+            dict_to_update[key] = value
+    return dict_to_update
+
+
+def merge_max(dict_to_update: Dict, mapping: Mapping) -> Dict:
+    """Merges one mapping like set_to_dict(dict_to_update, **mapping) does"""
+    return merge_max_pairs(dict_to_update, mapping.items())
+
+
+def merge_max_columns(dict_to_update: Dict, keys: Sequence, values: Sequence) -> Dict:
+    """Merges columnar (keys, values) pairs like set_to_dict calls with one pair each do"""
+    if np is not None and isinstance(keys, np.ndarray) and isinstance(values, np.ndarray) and len(keys):
+        # Reduce repeated keys to their maximum, keeping order of first occurrence
+        unique_keys, first_indices, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        maximums = np.full(len(unique_keys), values.min(), dtype=values.dtype)
+        np.maximum.at(maximums, inverse, values)
+        order = np.argsort(first_indices)
+        keys, values = unique_keys[order].tolist(), maximums[order].tolist()
+    return merge_max_pairs(dict_to_update, zip(keys, values))
+
+
+def fold_mappings(mappings: List[Mapping]) -> Dict:
+    folded = {}
+    for mapping in mappings:
+        merge_max(folded, mapping)
+    return folded
+
+
+def merge_pair(pair: List[Dict]) -> Dict:
+    return merge_max(pair[0], pair[1]) if len(pair) == 2 else pair[0]
+
+
+def chunked(iterable: Iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def set_to_dict_batch(dict_to_update: Dict, mappings: Iterable[Mapping] = (), keys: Sequence = None,
+                      values: Sequence = None, workers: int = None, chunk_size: int = 10_000) -> Dict:
+    """Folds many mappings (and columnar keys and values) into dict, keeping the maximum value of every key.
+    The result is the same as sequential set_to_dict calls. With workers != 1 large inputs are folded
+    in process pool: chunks of mappings are folded, then partial results are merged pairwise (tree reduction).
+    It pays off only on many cores, as mappings have to be pickled for worker processes.
+    """
+    mappings = mappings if isinstance(mappings, list) else list(mappings)
+    if workers is None or workers == 1 or len(mappings) < PARALLEL_MAPPINGS_NUMBER:
+        for mapping in mappings:
+            merge_max(dict_to_update, mapping)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(fold_mappings, chunked(mappings, chunk_size)))
+            while len(partials) > 1:
+                partials = list(executor.map(merge_pair, chunked(partials, 2)))
+        merge_max(dict_to_update, partials[0])
+
+    if keys is not None:
+        merge_max_columns(dict_to_update, keys, values)
+    return dict_to_update
+
+
 if __name__ == '__main__':
     print(set_to_dict({'a': 1, 'b': 2, 'c': 3}, a=0, b=4))
     print(set_to_dict({}, a=0))
-    print(set_to_dict({'a': 5}))
\ No newline at end of file
+    print(set_to_dict({'a': 5}))
+    print(set_to_dict_batch({'a': 1, 'b': 2, 'c': 3}, [{'a': 0, 'b': 4}, {'c': 5}], keys=['a', 'a'], values=[2, 7]))
@@ -12,7 +12,10 @@ Examples:
     >>> build_from_unique_words(word_number=10)
     ''
 """
-from typing import Iterable
+from typing import Iterable, Iterator
+import re
+
+WORD_PATTERN = re.compile(r"\S+")
 
 
 def build_from_unique_words(*lines: Iterable[str], word_number: int) -> str:
@@ -25,8 +28,31 @@ def build_from_unique_words(*lines: Iterable[str], word_number: int) -> str:
     return_str = " ".join(return_words)
     return return_str
 
+
+def iter_unique_words(lines: Iterable[str], word_number: int) -> Iterator[str]:
+    """Yields unique word of given number from each line (lines without it are skipped).
+    Lines can be any iterable, e.g. file object. Words are found lazily and scanning of line
+    stops as soon as the word is found, so the rest of long lines is not tokenized.
+    """
+    for line in lines:
+        seen = set()
+        for match in WORD_PATTERN.finditer(line):
+            word = match.group()
+            if word in seen:
+                continue
+            if len(seen) == word_number:
+                yield word
+                break
+            seen.add(word)
+
+
+def build_from_unique_words_stream(lines: Iterable[str], word_number: int) -> str:
+    return " ".join(iter_unique_words(lines, word_number))
+
+
 if __name__ == '__main__':
     print(build_from_unique_words('a b c', '1 1 1 2 3', 'cat dog milk', word_number=1))
     print(build_from_unique_words('a b c', '', 'cat dog milk', word_number=0))
     print(build_from_unique_words('1 2', '1 2 3', word_number=10))
-    print(build_from_unique_words(word_number=10))
\ No newline at end of file
+    print(build_from_unique_words(word_number=10))
+    print(build_from_unique_words_stream(['a b c', '1 1 1 2 3', 'cat dog milk'], word_number=1))
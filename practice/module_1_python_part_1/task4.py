@@ -6,7 +6,15 @@ Examples:
     >>> calculate_power_with_difference([1, 2, 3])
     [1, 4, 7]  # because [1^2, 2^2 - (1^2 - 1), 3^2 - (2^2 - 2)]
 """
-from typing import List
+from typing import List, Iterable, Iterator
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_SAFE_LIMIT = 2 ** 30 # results of smaller (by absolute value) integers fit into int64
 
 
 def calculate_power_with_difference(ints: List[int]) -> List[int]:
@@ -16,5 +24,52 @@ def calculate_power_with_difference(ints: List[int]) -> List[int]:
             return_list.append(int ** 2 - (ints[i - 1] ** 2 - ints[i - 1]))
     return return_list
 
+
+def to_python_number(value):
+    """Converts NumPy scalar to Python int or float (other values are returned as is)"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def calculate_chunk(ints: List[int], previous: int = None) -> List[int]:
+    """Calculates values for chunk of integers, previous is the integer before chunk (None for the first chunk)"""
+    if len(ints) == 0:
+        return []
+    # Float previous value would be truncated in int64 array
+    if np is not None and (previous is None or
+                           isinstance(previous, (int, np.integer)) and abs(previous) < INT64_SAFE_LIMIT):
+        array = np.asarray(ints)
+        if array.dtype.kind in "iu" and -INT64_SAFE_LIMIT < int(array.min()) and int(array.max()) < INT64_SAFE_LIMIT:
+            # a**2 - shift(a**2 - a)
+            array = array.astype(np.int64)
+            squares = array * array
+            result = squares.copy()
+            result[1:] -= squares[:-1] - array[:-1]
+            if previous is not None:
+                previous = int(previous)
+                result[0] -= previous * previous - previous
+            return result.tolist()
+
+    # Python integers never overflow (squares of NumPy integers would wrap silently)
+    ints = ints.tolist() if hasattr(ints, "tolist") else [to_python_number(i) for i in ints]
+    previous = to_python_number(previous)
+    result = [ints[0] ** 2 if previous is None else ints[0] ** 2 - (previous ** 2 - previous)]
+    result.extend(b ** 2 - (a ** 2 - a) for a, b in zip(ints, islice(ints, 1, None)))
+    return result
+
+
+def calculate_power_with_difference_vectorized(ints: List[int]) -> List[int]:
+    return calculate_chunk(ints)
+
+
+def iter_power_with_difference(ints: Iterable[int], chunk_size: int = 65536) -> Iterator[int]:
+    """Yields values for stream of integers chunk by chunk (memory does not depend on stream length)"""
+    iterator = iter(ints)
+    previous = None
+    while chunk := list(islice(iterator, chunk_size)):
+        yield from calculate_chunk(chunk, previous)
+        previous = chunk[-1]
+
+
 if __name__ == '__main__':
     print(calculate_power_with_difference([1, 2, 3]))
+    print(list(iter_power_with_difference(iter([1, 2, 3]), chunk_size=2)))
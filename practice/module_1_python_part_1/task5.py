@@ -10,6 +10,94 @@ Examples:
     >>> remove_duplicated_words('1 2 3')
     '1 2 3'
 """
+from typing import Iterable, Iterator, Union, TextIO
+from hashlib import blake2b
+import io
+import math
+
+BUFFER_SIZE = 1 << 16 # characters read and written at once
+
+
+class BloomFilter:
+    """Approximate set of strings with bounded memory (false positives are possible, false negatives are not)"""
+    __slots__ = ("size", "hashes_number", "bits")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes_number = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> bool:
+        """Adds item, returns True if it was not in filter before"""
+        # Double hashing: positions are h1 + i * h2
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        bits, size = self.bits, self.size
+        is_new = False
+        for i in range(self.hashes_number):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                is_new = True
+        return is_new
+
+
+def read_chunks(source: Union[TextIO, Iterable[str]], buffer_size: int = BUFFER_SIZE) -> Iterable[str]:
+    """Reads file object in fixed-size buffers (other iterables of strings are returned as they are)"""
+    if hasattr(source, "read"):
+        return iter(lambda: source.read(buffer_size), "")
+    return source
+
+
+def iter_words(chunks: Iterable[str]) -> Iterator[str]:
+    """Yields space separated words from chunks, joining words which are split between chunks"""
+    carry = ""
+    for chunk in chunks:
+        words = (carry + chunk).split(" ")
+        carry = words.pop()
+        yield from words
+    yield carry
+
+
+def iter_unique_words(words: Iterable[str], approximate: bool = False, capacity: int = 10_000_000,
+                      error_rate: float = 0.01) -> Iterator[str]:
+    """Yields words which were not seen before.
+    In approximate mode seen words are kept in Bloom filter of fixed size (for given capacity and error rate),
+    so some unique words can be dropped as false positives.
+    """
+    if approximate:
+        bloom_filter = BloomFilter(capacity, error_rate)
+        yield from filter(bloom_filter.add, words)
+        return
+
+    seen = set()
+    for word in words:
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+
+def remove_duplicated_words_stream(source: Union[TextIO, Iterable[str]], output: TextIO = None,
+                                   buffer_size: int = BUFFER_SIZE, **unique_kwargs) -> Union[str, None]:
+    """Removes duplicated words from file object or iterable of string chunks, writing result to output
+    in chunks of about buffer_size characters (the result is returned as string if there is no output)
+    """
+    result = io.StringIO() if output is None else output
+    buffer = []
+    buffered_size = 0
+    separator = ""
+    for word in iter_unique_words(iter_words(read_chunks(source, buffer_size)), **unique_kwargs):
+        buffer.append(separator)
+        buffer.append(word)
+        separator = " "
+        buffered_size += len(word) + 1
+        if buffered_size >= buffer_size:
+            result.write("".join(buffer))
+            buffer.clear()
+            buffered_size = 0
+    result.write("".join(buffer))
+    return result.getvalue() if output is None else None
 
 
 def remove_duplicated_words(line: str) -> str:
@@ -19,4 +107,5 @@ def remove_duplicated_words(line: str) -> str:
 if __name__ == '__main__':
     print(remove_duplicated_words('cat cat dog 1 dog 2'))
     print(remove_duplicated_words('cat cat cat'))
-    print(remove_duplicated_words('1 2 3'))
\ No newline at end of file
+    print(remove_duplicated_words('1 2 3'))
+    print(remove_duplicated_words_stream(io.StringIO('cat cat dog 1 dog 2'), buffer_size=4))
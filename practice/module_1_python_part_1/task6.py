@@ -16,9 +16,14 @@ with open(filename) as opened_file:
     for line in opened_file:
         ...
 """
-from typing import Tuple
+from typing import Tuple, List
+from concurrent.futures import ProcessPoolExecutor
+import mmap
 import os
 
+BLOCK_SIZE = 1 << 24 # bytes parsed at once (memory of one worker is bounded by it)
+PARALLEL_FILE_SIZE = 1 << 26 # scan file in process pool only if it is at least so large
+
 
 def get_min_max(filename: str) -> Tuple[int, int]:
     file_path = os.path.join(os.path.dirname(__file__), filename)
@@ -28,5 +33,66 @@ def get_min_max(filename: str) -> Tuple[int, int]:
             lines.append(int(line))
     return (min(lines), max(lines))
 
+
+def find_line_start(mm: mmap.mmap, offset: int) -> int:
+    """Finds start of the first line which starts at or after offset"""
+    if offset == 0:
+        return 0
+    newline = mm.find(b"\n", offset - 1)
+    return len(mm) if newline == -1 else newline + 1
+
+
+def split_chunks(mm: mmap.mmap, chunks_number: int) -> List[Tuple[int, int]]:
+    """Splits file into (start, end) chunks at newline boundaries"""
+    bounds = [find_line_start(mm, len(mm) * i // chunks_number) for i in range(chunks_number)] + [len(mm)]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def scan_chunk(args: Tuple[str, int, int, int]) -> Tuple[int, int]:
+    """Getting min and max integer of file chunk, parsing it block by block"""
+    file_path, start, end, block_size = args
+    minimum = maximum = None
+    with open(file_path, "rb") as opened_file, mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while start < end:
+            # Block ends at the last newline inside it (or at the first one after it for very long lines)
+            block_end = mm.rfind(b"\n", start, min(start + block_size, end)) + 1
+            if block_end <= start:
+                block_end = find_line_start(mm, min(start + block_size, end))
+            block_end = min(block_end, end)
+            values = list(map(int, mm[start:block_end].split()))
+            start = block_end
+            if not values:
+                continue
+            block_min, block_max = min(values), max(values)
+            minimum = block_min if minimum is None or block_min < minimum else minimum
+            maximum = block_max if maximum is None or block_max > maximum else maximum
+    return minimum, maximum
+
+
+def get_min_max_mmap(filename: str, workers: int = None, block_size: int = BLOCK_SIZE) -> Tuple[int, int]:
+    """Getting min and max integer from memory-mapped file split into per-core chunks at newline boundaries"""
+    file_path = os.path.join(os.path.dirname(__file__), filename)
+    if os.path.getsize(file_path) == 0:
+        raise ValueError("get_min_max_mmap() arg is an empty file")
+    workers = workers or os.cpu_count()
+    with open(file_path, "rb") as opened_file, mmap.mmap(opened_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunks = split_chunks(mm, workers)
+        parallel = workers > 1 and len(mm) >= PARALLEL_FILE_SIZE
+
+    tasks = [(file_path, start, end, block_size) for start, end in chunks]
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(scan_chunk, tasks))
+    else:
+        partials = list(map(scan_chunk, tasks))
+
+    # Merge partial results of chunks
+    partials = [p for p in partials if p[0] is not None]
+    if not partials:
+        raise ValueError("get_min_max_mmap() arg is a file without integers")
+    return min(p[0] for p in partials), max(p[1] for p in partials)
+
+
 if __name__ == '__main__':
-    print(get_min_max('task6.txt'))
\ No newline at end of file
+    print(get_min_max('task6.txt'))
+    print(get_min_max_mmap('task6.txt'))
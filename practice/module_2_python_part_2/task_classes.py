@@ -23,12 +23,20 @@ Attributes:
 Methods:
     create_homework - request task text and number of days to complete, returns Homework object
     Note that this method doesn't need object itself
+4. HomeworkRegistry
+Methods:
+    add - add Homework object
+    active, expiring, expire_now - query homeworks by deadline with one clock reading
 PEP8 comply strictly.
 """
+import bisect
 import datetime
+from operator import attrgetter
 
 
 class Teacher:
+    __slots__ = ("first_name", "last_name")
+
     def __init__(self, first_name, last_name):
         self.first_name = first_name
         self.last_name = last_name
@@ -40,12 +48,15 @@ class Teacher:
 
 
 class Student:
+    __slots__ = ("first_name", "last_name")
+
     def __init__(self, first_name, last_name):
         self.first_name = first_name
         self.last_name = last_name
     @staticmethod
-    def do_homework(homework):
-        if datetime.datetime.now() > homework.deadline:
+    def do_homework(homework, now=None):
+        now = datetime.datetime.now() if now is None else now
+        if now > homework.deadline:
             print("You are late")
             return None
         else:
@@ -54,13 +65,59 @@ class Student:
 
 
 class Homework:
-    def __init__(self, text, days):
+    __slots__ = ("text", "deadline", "created")
+
+    def __init__(self, text, days, now=None):
+        now = datetime.datetime.now() if now is None else now
         self.text = text
-        self.deadline = datetime.datetime.now() + datetime.timedelta(days = days)
-        self.created = datetime.datetime.now()
-    def is_active(self):
-        return datetime.datetime.now() < self.deadline
+        self.deadline = now + datetime.timedelta(days = days)
+        self.created = now
+    def is_active(self, now=None):
+        now = datetime.datetime.now() if now is None else now
+        return now < self.deadline
+
 
+get_deadline = attrgetter("deadline")
+
+
+class HomeworkRegistry:
+    """Homeworks sorted by deadline, queried with one clock reading
+
+    Queries take O(log n + k). Expired homeworks are skipped by moving start
+    and removed from list only when they are more than half of it, so expire_now
+    takes amortized O(log n + k). add takes O(log n) comparisons but inserting
+    into list still shifts O(n) references.
+    """
+    __slots__ = ("homeworks", "start")
+
+    def __init__(self, homeworks=()):
+        self.homeworks = sorted(homeworks, key = get_deadline)
+        self.start = 0
+    def __len__(self):
+        return len(self.homeworks) - self.start
+    def add(self, homework):
+        bisect.insort_right(self.homeworks, homework, lo = self.start, key = get_deadline)
+    def active(self, now=None):
+        """All homeworks which are active at now"""
+        now = datetime.datetime.now() if now is None else now
+        return self.homeworks[bisect.bisect_right(self.homeworks, now, lo = self.start, key = get_deadline):]
+    def expiring(self, window, now=None):
+        """Active homeworks with deadline in (now, now + window]"""
+        now = datetime.datetime.now() if now is None else now
+        start = bisect.bisect_right(self.homeworks, now, lo = self.start, key = get_deadline)
+        end = bisect.bisect_right(self.homeworks, now + window, lo = start, key = get_deadline)
+        return self.homeworks[start:end]
+    def expire_now(self, now=None):
+        """Removes and returns homeworks which are not active at now"""
+        now = datetime.datetime.now() if now is None else now
+        end = bisect.bisect_right(self.homeworks, now, lo = self.start, key = get_deadline)
+        expired = self.homeworks[self.start:end]
+        self.start = end
+        # Compact list when expired homeworks take more than half of it
+        if self.start * 2 > len(self.homeworks):
+            del self.homeworks[:self.start]
+            self.start = 0
+        return expired
 
 if __name__ == '__main__':
     teacher = Teacher('Dmitry', 'Orlyakov')
@@ -80,3 +137,8 @@ if __name__ == '__main__':
 
     student.do_homework(oop_homework)
     student.do_homework(expired_homework)  # You are late
+
+    registry = HomeworkRegistry([expired_homework, oop_homework])
+    registry.active()  # [oop_homework]
+    registry.expiring(datetime.timedelta(days = 1))  # []
+    registry.expire_now()  # [expired_homework]
@@ -14,10 +14,18 @@ Example:
     result.txt(content: "23, 78, 3")
 """
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+BUFFER_SIZE = 1 << 20 # characters read and written at once
+
+def get_file_number(name):
+    return int(name.split("_")[1].split(".")[0])
 
 def read_write(input_dir = "files", output_dir= "result.txt"):
     files = os.listdir(input_dir)
-    files.sort(key = lambda name: int(name.split("_")[1].split(".")[0]))
+    files.sort(key = get_file_number)
     lines = []
     for filename in files:
         file_path = os.path.join(input_dir, filename)
@@ -25,4 +33,52 @@ def read_write(input_dir = "files", output_dir= "result.txt"):
             for line in opened_file:
                 lines.append(line)
     with open(output_dir, "w") as new_file:
-        new_file.write(",".join(lines))
\ No newline at end of file
+        new_file.write(",".join(lines))
+
+def read_file(file_path):
+    with open(file_path, "r") as opened_file:
+        return opened_file.read()
+
+def iter_file_chunks(file_path, buffer_size):
+    with open(file_path, "r") as opened_file:
+        yield from iter(lambda: opened_file.read(buffer_size), "")
+
+def iter_prefetched_files(file_paths, prefetch):
+    """Yields contents of files (as one chunk) while the next files are read in background threads"""
+    with ThreadPoolExecutor(max_workers = prefetch) as executor:
+        paths = iter(file_paths)
+        futures = deque(executor.submit(read_file, path) for path in islice(paths, prefetch))
+        while futures:
+            content = futures.popleft().result()
+            for path in islice(paths, 1):
+                futures.append(executor.submit(read_file, path))
+            yield [content] if content else []
+
+def read_write_stream(input_dir = "files", output_dir = "result.txt", buffer_size = BUFFER_SIZE, prefetch = 0):
+    """Streaming version of read_write: files are copied to result chunk by chunk, so memory does not grow
+    with number or size of files. With prefetch > 0 so many next files are read in background threads.
+    """
+    entries = sorted(os.scandir(input_dir), key = lambda entry: get_file_number(entry.name))
+    file_paths = [entry.path for entry in entries]
+    if prefetch > 0:
+        files = iter_prefetched_files(file_paths, prefetch)
+    else:
+        files = (iter_file_chunks(path, buffer_size) for path in file_paths)
+
+    # Lines are joined with commas: comma goes after every line end which is followed by more content
+    with open(output_dir, "w", buffering = buffer_size) as new_file:
+        is_comma_pending = False
+        for chunks in files:
+            last_chunk = ""
+            for chunk in chunks:
+                if is_comma_pending:
+                    new_file.write(",")
+                is_comma_pending = chunk.endswith("\n")
+                if is_comma_pending:
+                    new_file.write(chunk[:-1].replace("\n", "\n,") + "\n")
+                else:
+                    new_file.write(chunk.replace("\n", "\n,"))
+                last_chunk = chunk
+            # The last line of file has no line end
+            if last_chunk:
+                is_comma_pending = True
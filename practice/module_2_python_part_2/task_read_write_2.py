@@ -10,6 +10,18 @@ Example:
         file1.txt (content: "abc\ndef\nxyz", encoding: UTF-8)
         file2.txt (content: "xyz,def,abc", encoding: CP1252)
 """
+import os
+import string
+from itertools import accumulate
+
+CHUNK_SIZE = 1 << 16 # words encoded and written at once
+LETTERS_NUMBER = len(string.ascii_lowercase)
+# Random byte is mapped to letter only if it is less than 234 (= 26 * 9), so all letters are equally probable
+LETTER_BYTES_LIMIT = 256 // LETTERS_NUMBER * LETTERS_NUMBER
+LETTERS_TABLE = bytes(string.ascii_lowercase[b % LETTERS_NUMBER].encode()[0] for b in range(256))
+REJECTED_BYTES = bytes(range(LETTER_BYTES_LIMIT, 256))
+# Word length from 3 to 10 (8 values, so all lengths are equally probable)
+LENGTHS_TABLE = bytes(b % 8 + 3 for b in range(256))
 
 
 def generate_words(n=20):
@@ -23,8 +35,55 @@ def generate_words(n=20):
 
     return words
 
+def generate_words_bulk(n=20):
+    """Generating n random words from few os.urandom calls instead of random calls per word"""
+    lengths = os.urandom(n).translate(LENGTHS_TABLE)
+    letters_number = sum(lengths)
+
+    # Draw bytes until there are enough accepted ones
+    letters = b""
+    while len(letters) < letters_number:
+        missing = letters_number - len(letters)
+        letters += os.urandom(missing + missing // 8 + 16).translate(LETTERS_TABLE, REJECTED_BYTES)
+    letters = letters[:letters_number].decode("ascii")
+
+    ends = list(accumulate(lengths))
+    return [letters[end - length:end] for end, length in zip(ends, lengths)]
+
 def read_write_2(words, file1="file1.txt", file2="file2.txt"):
     with open(file1, 'w', encoding="utf-8") as f1:
         f1.write("\n".join(words))
     with open(file2, 'w', encoding="cp1252") as f2:
         f2.write(",".join(words))
+
+def iter_chunks(words, chunk_size, reverse=False):
+    """Getting chunks of words (in reversed order if reverse is True)"""
+    if not reverse:
+        for start in range(0, len(words), chunk_size):
+            yield words[start:start + chunk_size]
+        return
+    for end in range(len(words), 0, -chunk_size):
+        chunk = words[max(end - chunk_size, 0):end]
+        chunk.reverse()
+        yield chunk
+
+def write_chunks(file, encoding, separator, chunks):
+    """Writing separated words chunk by chunk; on encoding error file is left empty (like after one write)"""
+    with open(file, 'w', encoding=encoding) as f:
+        try:
+            for i, chunk in enumerate(chunks):
+                if i:
+                    f.write(separator)
+                f.write(separator.join(chunk))
+        except UnicodeEncodeError:
+            f.seek(0)
+            f.truncate()
+            raise
+
+def read_write_2_stream(words, file1="file1.txt", file2="file2.txt", chunk_size=CHUNK_SIZE, reverse=False):
+    """Streaming version of read_write_2: words are joined and encoded chunk by chunk.
+    With reverse=True second file gets words in reversed order, reading chunks from the end.
+    """
+    words = list(words)
+    write_chunks(file1, "utf-8", "\n", iter_chunks(words, chunk_size))
+    write_chunks(file2, "cp1252", ",", iter_chunks(words, chunk_size, reverse))
@@ -6,7 +6,7 @@ https://docs.pytest.org/en/6.2.x/tmpdir.html
 """
 
 import pytest
-from practice.module_2_python_part_2.task_read_write import read_write
+from practice.module_2_python_part_2.task_read_write import read_write, read_write_stream
 
 @pytest.mark.parametrize("file_contents, expected_result", [
     (["23", "78", "3"], "23,78,3"),
@@ -27,4 +27,29 @@ def test_read_write_basic(tmp_path, file_contents, expected_result):
     read_write(input_dir=str(input_dir), output_dir=str(output_dir))
 
     actual_result = output_dir.read_text()
-    assert actual_result == expected_result
\ No newline at end of file
+    assert actual_result == expected_result
+
+@pytest.mark.parametrize("file_contents", [
+    ["23", "78", "3"],
+    ["", "78", "3"],
+    ["23\n", "78\n", "3\n"],
+    ["a\nb\n\nc", "", "d\ne\n", "f"],
+    ["23"],
+    []]
+)
+@pytest.mark.parametrize("buffer_size, prefetch", [(1, 0), (2, 0), (1 << 20, 0), (1 << 20, 2)])
+@pytest.mark.read_write_stream
+def test_read_write_stream(tmp_path, file_contents, buffer_size, prefetch):
+    input_dir = tmp_path / "files"
+    input_dir.mkdir()
+    expected_path = tmp_path / "expected.txt"
+    output_dir = tmp_path / "result.txt"
+
+    # More than 10 files check numeric (not alphabetical) order
+    for i, content in enumerate(file_contents * 4):
+        file_path = input_dir / f"_{i}.txt"
+        file_path.write_text(content)
+    read_write(input_dir=str(input_dir), output_dir=str(expected_path))
+    read_write_stream(input_dir=str(input_dir), output_dir=str(output_dir), buffer_size=buffer_size, prefetch=prefetch)
+
+    assert output_dir.read_text() == expected_path.read_text()
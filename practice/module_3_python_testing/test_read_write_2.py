@@ -7,7 +7,7 @@ https://docs.pytest.org/en/6.2.x/tmpdir.html
 
 
 import pytest
-from practice.module_2_python_part_2.task_read_write_2 import read_write_2
+from practice.module_2_python_part_2.task_read_write_2 import read_write_2, read_write_2_stream, generate_words_bulk
 import practice.module_2_python_part_2.task_read_write_2 as mod
 from unittest.mock import Mock
 
@@ -51,3 +51,43 @@ def test_read_write_2_unicode(setup_paths):
 
     assert output_file1.read_text(encoding="utf-8") == "ąćęłó\nźż"
     assert output_file2.read_text(encoding="latin-1") == ""
+
+
+@pytest.mark.read_write_2_stream
+def test_generate_words_bulk():
+    words = generate_words_bulk(10_000)
+
+    assert len(words) == 10_000
+    assert all(3 <= len(word) <= 10 and word.isascii() and word.islower() and word.isalpha() for word in words)
+
+
+@pytest.mark.parametrize("words", [
+    ["asddfg", "kahfc", "aefj"],
+    ["", "kahfc", "aefj"],
+    ["asddfg"],
+    [],
+    generate_words_bulk(100)]
+)
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+@pytest.mark.read_write_2_stream
+def test_read_write_2_stream(setup_paths, words, chunk_size):
+    output_file1, output_file2 = setup_paths
+
+    read_write_2_stream(words, file1=str(output_file1), file2=str(output_file2), chunk_size=chunk_size)
+    assert output_file1.read_text() == "\n".join(words)
+    assert output_file2.read_text() == ",".join(words)
+
+    read_write_2_stream(words, file1=str(output_file1), file2=str(output_file2), chunk_size=chunk_size, reverse=True)
+    assert output_file2.read_text() == ",".join(reversed(words))
+
+
+@pytest.mark.read_write_2_stream
+def test_read_write_2_stream_unicode(setup_paths):
+    words = ["abc", "ąćęłó", "źż"]
+    output_file1, output_file2 = setup_paths
+
+    with pytest.raises(UnicodeEncodeError):
+        read_write_2_stream(words, file1=str(output_file1), file2=str(output_file2), chunk_size=1)
+
+    assert output_file1.read_text(encoding="utf-8") == "abc\nąćęłó\nźż"
+    assert output_file2.read_text(encoding="latin-1") == ""
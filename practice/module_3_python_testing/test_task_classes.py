@@ -9,6 +9,7 @@ import datetime
 from practice.module_2_python_part_2.task_classes import Homework
 from practice.module_2_python_part_2.task_classes import Teacher
 from practice.module_2_python_part_2.task_classes import Student
+from practice.module_2_python_part_2.task_classes import HomeworkRegistry
 
 @pytest.mark.homework_creation
 def test_homework_creation():
@@ -73,4 +74,47 @@ def test_create_homework_not_active():
     hw = teacher.create_homework('Learn functions', -1)
     assert isinstance(hw.created, datetime.datetime)
     assert isinstance(hw.deadline, datetime.datetime)
-    assert hw.text == 'Learn functions'
\ No newline at end of file
+    assert hw.text == 'Learn functions'
+
+@pytest.mark.homework_registry
+def test_classes_have_slots():
+    for obj in (Teacher('Dmitry', 'Orlyakov'), Student('Vladislav', 'Popov'), Homework("test", 1)):
+        assert not hasattr(obj, "__dict__")
+
+
+@pytest.mark.homework_registry
+def test_homework_registry():
+    now = datetime.datetime(2024, 1, 10)
+    homeworks = [Homework(f"test {days}", days, now=now) for days in (3, -1, 1, 0, 7, 2)]
+    registry = HomeworkRegistry(homeworks[:3])
+    for hw in homeworks[3:]:
+        registry.add(hw)
+
+    assert len(registry) == 6
+    assert [hw.text for hw in registry.active(now)] == ["test 1", "test 2", "test 3", "test 7"]
+    assert [hw.text for hw in registry.expiring(datetime.timedelta(days=2), now)] == ["test 1", "test 2"]
+    assert all(hw.is_active(now) for hw in registry.active(now))
+
+    expired = registry.expire_now(now + datetime.timedelta(days=1))
+    assert [hw.text for hw in expired] == ["test -1", "test 0", "test 1"]
+    assert not any(hw.is_active(now + datetime.timedelta(days=1)) for hw in expired)
+    assert len(registry) == 3
+    assert registry.expire_now(now) == []
+
+
+@pytest.mark.homework_registry
+def test_homework_registry_after_expire():
+    now = datetime.datetime(2024, 1, 10)
+    registry = HomeworkRegistry([Homework(f"test {days}", days, now=now) for days in (1, 2, 3, 4)])
+    assert [hw.text for hw in registry.expire_now(now + datetime.timedelta(days=1))] == ["test 1"]
+
+    registry.add(Homework("test 0", 0, now=now))
+    registry.add(Homework("test 5", 5, now=now))
+    assert len(registry) == 5
+    assert [hw.text for hw in registry.active(now)] == ["test 2", "test 3", "test 4", "test 5"]
+
+    later = now + datetime.timedelta(days=3)
+    assert [hw.text for hw in registry.expire_now(later)] == ["test 0", "test 2", "test 3"]
+    assert [hw.text for hw in registry.active(later)] == ["test 4", "test 5"]
+    assert [hw.text for hw in registry.expiring(datetime.timedelta(days=1), later)] == ["test 4"]
+    assert len(registry) == 2
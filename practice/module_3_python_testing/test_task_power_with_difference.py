@@ -0,0 +1,39 @@
+"""
+Tests for calculate_power_with_difference versions in module_1_python_part_1/task4.py.
+Vectorized and chunked versions should give the same results as the original function,
+also for NumPy scalars, big integers and floats.
+"""
+
+import pytest
+import numpy as np
+from practice.module_1_python_part_1.task4 import calculate_power_with_difference
+from practice.module_1_python_part_1.task4 import calculate_power_with_difference_vectorized
+from practice.module_1_python_part_1.task4 import iter_power_with_difference
+
+@pytest.mark.power_with_difference
+@pytest.mark.parametrize("ints", [
+    [1, 2, 3],
+    [-5, 0, 7, 2**40, 3, -2**35],
+    [1.5, 2, 3.25],
+])
+@pytest.mark.parametrize("chunk_size", [1, 2, 4])
+def test_iter_power_with_difference(ints, chunk_size):
+    expected = calculate_power_with_difference(ints)
+    assert calculate_power_with_difference_vectorized(ints) == expected
+    assert list(iter_power_with_difference(iter(ints), chunk_size=chunk_size)) == expected
+
+@pytest.mark.power_with_difference
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_iter_power_with_difference_numpy_scalars(chunk_size):
+    array = np.array([2**40, 3, 5, -2**31, 7])
+    expected = calculate_power_with_difference([int(x) for x in array])
+    assert expected[:3] == [1208925819614629174706176, -1208925819613529663078391, 19]
+    assert list(iter_power_with_difference(array, chunk_size=chunk_size)) == expected
+    assert calculate_power_with_difference_vectorized(list(array)) == expected
+    assert calculate_power_with_difference_vectorized(array) == expected
+
+@pytest.mark.power_with_difference
+def test_iter_power_with_difference_small_numpy_scalars():
+    array = np.array([1, 2, 3, 4], dtype=np.int32)
+    assert list(iter_power_with_difference(array, chunk_size=3)) == [1, 4, 7, 10]
+    assert all(type(value) is int for value in iter_power_with_difference(array, chunk_size=3))
@@ -1,70 +1,443 @@
 import os
+import hashlib
 from lxml import etree
 import json
 from statistics import mean
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SOURCE_DATA_DIR = os.path.join(os.path.dirname(__file__), "source_data")
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
+MANIFEST_FILE = "manifest.json" # inputs of already generated partitions (in output dir)
+CACHE_FILE = "aggregates_cache.json" # statistics of already read .json files (in output dir)
+DEFAULT_COUNTRY = "Spain" # country of cities placed directly in source data dir
+PARALLEL_CITIES_NUMBER = 64 # read cities in process pool only if there are at least so many of them
+STREAMING_CITIES_NUMBER = 5000 # write .xml file city by city only if there are at least so many cities
+STATISTICS_BATCH_SIZE = 1024 # cities read and calculated together when .xml file is written city by city
+CITY_STATISTICS = ["mean_temp", "max_temp", "min_temp", "mean_wind_speed", "max_wind_speed", "min_wind_speed"]
+
+
+def load_hourly(data):
+    """Getting hourly data from .json file content"""
+    # Parse with fast orjson parser if it is installed
+    if orjson is not None:
+        return orjson.loads(data)["hourly"]
+    return json.loads(data)["hourly"]
+
+def read_city_data(city, date_city_file):
+    """Reading hourly temperatures and wind speeds of one city"""
+    date_city_data_dict = {"city": city, "date_city_file": date_city_file}
+
+    # Get information from a singular .json file
+    with open(date_city_file, "r") as f:
+        date_city_dict = load_hourly(f.read())
+
+    # Combine hourly data
+    date_city_data_dict["city_temps"] = [h["temp"] for h in date_city_dict]
+    date_city_data_dict["city_wind_speeds"] = [h["wind_speed"] for h in date_city_dict]
+    return date_city_data_dict
+
+def read_cities_data(cities, date_city_files, workers=None):
+    """Reading data of all cities (in process pool if there are many cities)"""
+    if len(cities) < PARALLEL_CITIES_NUMBER or workers == 1:
+        return list(map(read_city_data, cities, date_city_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(read_city_data, cities, date_city_files, chunksize=16))
+
+def calculate_city_statistics(d):
+    """Calculating statistics for one city"""
+    d["mean_temp"] = round(mean(d["city_temps"]), 2)
+    d["max_temp"] = round(max(d["city_temps"]), 2)
+    d["min_temp"] = round(min(d["city_temps"]), 2)
+    d["mean_wind_speed"] = round(mean(d["city_wind_speeds"]), 2)
+    d["max_wind_speed"] = round(max(d["city_wind_speeds"]), 2)
+    d["min_wind_speed"] = round(min(d["city_wind_speeds"]), 2)
+    return d
+
+def calculate_statistics(date_cities_data_dicts):
+    """Calculating statistics for cities and summary"""
+    # Calculate necessary statistics for cities
+    for d in date_cities_data_dicts:
+        calculate_city_statistics(d)
+
+    # Calculate necessary statistics for summary
+    return {
+        "mean_temp": round(mean(d["mean_temp"] for d in date_cities_data_dicts), 2),
+        "mean_wind_speed": round(mean(d["mean_wind_speed"] for d in date_cities_data_dicts), 2),
+        "coldest_place": min(date_cities_data_dicts, key = lambda x: x["mean_temp"])["city"],
+        "warmest_place": max(date_cities_data_dicts, key = lambda x: x["mean_temp"])["city"],
+        "windiest_place": max(date_cities_data_dicts, key = lambda x: x["mean_wind_speed"])["city"],
+    }
+
+class RunningSummary:
+    """Summary statistics updated city by city (the same values as calculate_statistics gives)"""
+    __slots__ = ("cities_number", "temps_sum", "wind_speeds_sum", "is_int_temps", "is_int_wind_speeds",
+                 "coldest", "warmest", "windiest")
+
+    def __init__(self):
+        self.cities_number = 0
+        # Exact sums, so the mean is the same as statistics.mean gives
+        self.temps_sum = Fraction(0)
+        self.wind_speeds_sum = Fraction(0)
+        self.is_int_temps = True
+        self.is_int_wind_speeds = True
+        # (city, mean) pairs, only strictly better values replace them like in min/max
+        self.coldest = None
+        self.warmest = None
+        self.windiest = None
+
+    def add(self, d):
+        """Adding one city with calculated statistics"""
+        self.cities_number += 1
+        self.temps_sum += Fraction(d["mean_temp"])
+        self.wind_speeds_sum += Fraction(d["mean_wind_speed"])
+        self.is_int_temps = self.is_int_temps and isinstance(d["mean_temp"], int)
+        self.is_int_wind_speeds = self.is_int_wind_speeds and isinstance(d["mean_wind_speed"], int)
+
+        if self.coldest is None or d["mean_temp"] < self.coldest[1]:
+            self.coldest = (d["city"], d["mean_temp"])
+        if self.warmest is None or d["mean_temp"] > self.warmest[1]:
+            self.warmest = (d["city"], d["mean_temp"])
+        if self.windiest is None or d["mean_wind_speed"] > self.windiest[1]:
+            self.windiest = (d["city"], d["mean_wind_speed"])
+
+    def get_mean(self, total, is_int):
+        value = total / self.cities_number
+        # statistics.mean of integers is integer when it is whole
+        return int(value) if is_int and value.denominator == 1 else float(value)
+
+    def summary(self):
+        """Getting summary dictionary"""
+        return {
+            "mean_temp": round(self.get_mean(self.temps_sum, self.is_int_temps), 2),
+            "mean_wind_speed": round(self.get_mean(self.wind_speeds_sum, self.is_int_wind_speeds), 2),
+            "coldest_place": self.coldest[0],
+            "warmest_place": self.warmest[0],
+            "windiest_place": self.windiest[0],
+        }
+
+def round_means(means, values_lists):
+    """Rounding NumPy means like round(statistics.mean(values), 2)"""
+    # Float sum error can change rounding only near x.xx5 (or sign of zero), so such means are recalculated exactly
+    rounded_means = []
+    for m, values in zip(means.tolist(), values_lists):
+        if abs(m * 100 % 1 - 0.5) < 1e-6 or abs(m) < 0.005:
+            m = mean(values)
+        # statistics.mean of integers is integer when it is whole
+        elif m.is_integer() and all(isinstance(v, int) for v in values):
+            m = int(m)
+        rounded_means.append(round(m, 2))
+    return rounded_means
+
+def pick_values(indices, values_lists):
+    """Picking original values (keeping int or float type) by index in every list"""
+    return [round(values[i], 2) for i, values in zip(indices.tolist(), values_lists)]
+
+def calculate_statistics_numpy(date_cities_data_dicts):
+    """Calculating statistics for cities and summary with NumPy (cities x hours matrices)"""
+    # Load hourly data into matrices (missing hours are NaN)
+    hours = max(max(len(d["city_temps"]), len(d["city_wind_speeds"])) for d in date_cities_data_dicts)
+    temps = np.full((len(date_cities_data_dicts), hours), np.nan)
+    wind_speeds = np.full((len(date_cities_data_dicts), hours), np.nan)
+    for i, d in enumerate(date_cities_data_dicts):
+        temps[i, :len(d["city_temps"])] = d["city_temps"]
+        wind_speeds[i, :len(d["city_wind_speeds"])] = d["city_wind_speeds"]
+
+    # Calculate necessary statistics for cities
+    city_temps = [d["city_temps"] for d in date_cities_data_dicts]
+    city_wind_speeds = [d["city_wind_speeds"] for d in date_cities_data_dicts]
+    city_statistics = {
+        "mean_temp": round_means(np.nanmean(temps, axis=1), city_temps),
+        "max_temp": pick_values(np.nanargmax(temps, axis=1), city_temps),
+        "min_temp": pick_values(np.nanargmin(temps, axis=1), city_temps),
+        "mean_wind_speed": round_means(np.nanmean(wind_speeds, axis=1), city_wind_speeds),
+        "max_wind_speed": pick_values(np.nanargmax(wind_speeds, axis=1), city_wind_speeds),
+        "min_wind_speed": pick_values(np.nanargmin(wind_speeds, axis=1), city_wind_speeds),
+    }
+    for key, values in city_statistics.items():
+        for d, value in zip(date_cities_data_dicts, values):
+            d[key] = value
+
+    # Calculate necessary statistics for summary
+    mean_temps = np.array(city_statistics["mean_temp"])
+    mean_wind_speeds = np.array(city_statistics["mean_wind_speed"])
+    return {
+        "mean_temp": round_means(np.mean(mean_temps, keepdims=True), [city_statistics["mean_temp"]])[0],
+        "mean_wind_speed": round_means(np.mean(mean_wind_speeds, keepdims=True),
+                                       [city_statistics["mean_wind_speed"]])[0],
+        "coldest_place": date_cities_data_dicts[int(np.argmin(mean_temps))]["city"],
+        "warmest_place": date_cities_data_dicts[int(np.argmax(mean_temps))]["city"],
+        "windiest_place": date_cities_data_dicts[int(np.argmax(mean_wind_speeds))]["city"],
+    }
+
+def get_file_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def read_city_file(city, date_city_file):
+    """Reading one city with signature of its file (size, modification time and content hash) for cache"""
+    stat = os.stat(date_city_file)
+    with open(date_city_file, "rb") as f:
+        data = f.read()
+    hourly = load_hourly(data.decode())
+    return {
+        "city": city,
+        "date_city_file": date_city_file,
+        "city_temps": [h["temp"] for h in hourly],
+        "city_wind_speeds": [h["wind_speed"] for h in hourly],
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": get_file_hash(data),
+    }
+
+
+class AggregateCache:
+    """Statistics of .json files keyed by path and checked by size, modification time and content hash"""
+    __slots__ = ("path", "entries")
+
+    def __init__(self, path=None, entries=None):
+        self.path = path
+        self.entries = {} if entries is None else entries
+        if entries is None and path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                self.entries = json.load(f)
+
+    def get(self, date_city_file):
+        """Getting cached statistics of file (None if file is not cached or has changed)"""
+        entry = self.entries.get(date_city_file)
+        if entry is None:
+            return None
+        stat = os.stat(date_city_file)
+        if entry["size"] != stat.st_size:
+            return None
+        # File was touched, so its content is compared
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            with open(date_city_file, "rb") as f:
+                if entry["hash"] != get_file_hash(f.read()):
+                    return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+        return entry["statistics"]
+
+    def put(self, date_city_file, entry):
+        self.entries[date_city_file] = entry
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f)
+
+
+def iter_cities_statistics(cities, date_city_files, workers=None, cache=None):
+    """Yielding statistics of cities batch by batch, reading only files which are not in cache"""
+    read = read_city_data if cache is None else read_city_file
+    with ExitStack() as stack:
+        executor = None
+        if len(cities) >= PARALLEL_CITIES_NUMBER and workers != 1:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+        for start in range(0, len(cities), STATISTICS_BATCH_SIZE):
+            batch_cities = cities[start:start + STATISTICS_BATCH_SIZE]
+            batch_files = date_city_files[start:start + STATISTICS_BATCH_SIZE]
+            statistics = [None if cache is None else cache.get(file) for file in batch_files]
+
+            # Read changed and new files and calculate their statistics together
+            missed = [i for i, s in enumerate(statistics) if s is None]
+            if missed:
+                missed_cities = [batch_cities[i] for i in missed]
+                missed_files = [batch_files[i] for i in missed]
+                if executor is None or len(missed) < PARALLEL_CITIES_NUMBER:
+                    date_cities_data_dicts = list(map(read, missed_cities, missed_files))
+                else:
+                    date_cities_data_dicts = list(executor.map(read, missed_cities, missed_files, chunksize=16))
+                if np is not None:
+                    calculate_statistics_numpy(date_cities_data_dicts)
+                else:
+                    calculate_statistics(date_cities_data_dicts)
+
+                for i, d in zip(missed, date_cities_data_dicts):
+                    statistics[i] = {key: d[key] for key in CITY_STATISTICS}
+                    if cache is not None:
+                        cache.put(d["date_city_file"], {
+                            "size": d["size"],
+                            "mtime_ns": d["mtime_ns"],
+                            "hash": d["hash"],
+                            "hours": len(d["city_temps"]),
+                            "statistics": statistics[i],
+                        })
+
+            for city, s in zip(batch_cities, statistics):
+                yield {"city": city, **s}
+
+def build_xml_file(country, date, cities, date_city_files, file, workers=None, cache=None):
+    """Building .xml file with weather of one country for one date"""
+    if cache is not None or len(cities) >= STREAMING_CITIES_NUMBER:
+        return stream_xml_file(country, date, cities, date_city_files, file, workers, cache)
+
+    # Create xml root and other elements
+    root = etree.Element("weather", country=country, date=date)
+    cities_el = etree.Element("cities")
+    root.append(cities_el)
+
+    # Generate list of dictionaries from .json files
+    date_cities_data_dicts = read_cities_data(cities, date_city_files, workers)
+
+    # Calculate necessary statistics for cities and summary
+    if np is not None:
+        summary = calculate_statistics_numpy(date_cities_data_dicts)
+    else:
+        summary = calculate_statistics(date_cities_data_dicts)
+
+    # Add all cities to the .xml file structure
+    for d in date_cities_data_dicts:
+        city = etree.Element(d["city"].replace(" ", "_"), mean_temp=str(d["mean_temp"]), max_temp=str(d["max_temp"]),
+                                  min_temp=str(d["min_temp"]), mean_wind_speed=str(d["mean_wind_speed"]),
+                                  max_wind_speed=str(d["max_wind_speed"]), min_wind_speed=str(d["min_wind_speed"]))
+        cities_el.append(city)
+
+    # Add summary to the .xml file structure
+    root.append(etree.Element("summary", mean_temp=str(summary["mean_temp"]),
+                              mean_wind_speed=str(summary["mean_wind_speed"]),
+                              coldest_place=summary["coldest_place"], warmest_place=summary["warmest_place"],
+                              windiest_place=summary["windiest_place"]))
+
+    # Create .xml file
+    tree = etree.ElementTree(root)
+    tree.write(file, pretty_print=True)
+    return file
+
+def stream_xml_file(country, date, cities, date_city_files, file, workers=None, cache=None):
+    """Writing .xml file city by city (memory depends on batch size, not on number of cities)
+
+    Cached statistics are merged into summary without reading their files.
+    """
+    running_summary = RunningSummary()
+    with open(file, "wb") as f:
+        with etree.xmlfile(f) as xf:
+            # Indentation is written manually to get the same output as pretty printed tree
+            with xf.element("weather", country=country, date=date):
+                xf.write("\n  ")
+                with xf.element("cities"):
+                    for d in iter_cities_statistics(cities, date_city_files, workers, cache):
+                        running_summary.add(d)
+                        xf.write("\n    ")
+                        xf.write(etree.Element(d["city"].replace(" ", "_"), mean_temp=str(d["mean_temp"]),
+                                               max_temp=str(d["max_temp"]), min_temp=str(d["min_temp"]),
+                                               mean_wind_speed=str(d["mean_wind_speed"]),
+                                               max_wind_speed=str(d["max_wind_speed"]),
+                                               min_wind_speed=str(d["min_wind_speed"])))
+                    xf.write("\n  ")
+
+                # Add summary after all cities are written
+                summary = running_summary.summary()
+                xf.write("\n  ")
+                xf.write(etree.Element("summary", mean_temp=str(summary["mean_temp"]),
+                                       mean_wind_speed=str(summary["mean_wind_speed"]),
+                                       coldest_place=summary["coldest_place"], warmest_place=summary["warmest_place"],
+                                       windiest_place=summary["windiest_place"]))
+                xf.write("\n")
+        f.write(b"\n")
+    return file
+
+def generate_xml_file(workers=None, cache_file=None):
+    cache = None if cache_file is None else AggregateCache(cache_file)
 
-def generate_xml_file():
     # Get city names and the date
-    cities = os.listdir(os.path.join(os.path.dirname(__file__), "source_data"))
-    dates = set([os.listdir(os.path.join(os.path.dirname(__file__), "source_data", c))[0].split(".")[0] for c in cities])
+    cities = os.listdir(SOURCE_DATA_DIR)
+    dates = set([os.listdir(os.path.join(SOURCE_DATA_DIR, c))[0].split(".")[0] for c in cities])
 
     for date in dates:
-        # Create xml root and other elements
-        root = etree.Element("weather", country="Spain", date=date)
-        cities_el = etree.Element("cities")
-        root.append(cities_el)
-
-        # Generate list of dictionaries from .json files
-        date_cities_data_dicts = []
-
-        for i, c in enumerate(cities):
-            date_city_data_dict = {"city": c, "city_temps": [], "city_wind_speeds": []}
-            date_city_file = os.path.join(os.path.dirname(__file__), "source_data", c, f"{date}.json")
-            date_city_data_dict["date_city_file"] = date_city_file
-
-            # Get information from a singular .json file
-            with open(date_city_file, "r") as f:
-                date_city_dict = json.loads(f.read())["hourly"]
-
-            # Combine hourly data
-            for h in date_city_dict:
-                date_city_data_dict["city_temps"].append(h["temp"])
-                date_city_data_dict["city_wind_speeds"].append(h["wind_speed"])
-
-            date_cities_data_dicts.append(date_city_data_dict)
-
-        # Calculate necessary statistics for cities
-        for d in date_cities_data_dicts:
-            d["mean_temp"] = round(mean(d["city_temps"]), 2)
-            d["max_temp"] = round(max(d["city_temps"]), 2)
-            d["min_temp"] = round(min(d["city_temps"]), 2)
-            d["mean_wind_speed"] = round(mean(d["city_wind_speeds"]), 2)
-            d["max_wind_speed"] = round(max(d["city_wind_speeds"]), 2)
-            d["min_wind_speed"] = round(min(d["city_wind_speeds"]), 2)
-
-            # Add all cities to the .xml file structure
-            city = etree.Element(d["city"].replace(" ", "_"), mean_temp=str(d["mean_temp"]), max_temp=str(d["max_temp"]),
-                                      min_temp=str(d["min_temp"]), mean_wind_speed=str(d["mean_wind_speed"]),
-                                      max_wind_speed=str(d["max_wind_speed"]), min_wind_speed=str(d["min_wind_speed"]))
-            cities_el.append(city)
-
-        # Calculate necessary statistics for summary
-        mean_temp = round(mean(d["mean_temp"] for d in date_cities_data_dicts), 2)
-        mean_wind_speed = round(mean(d["mean_wind_speed"] for d in date_cities_data_dicts), 2)
-        coldest_place = min(date_cities_data_dicts, key = lambda x: x["mean_temp"])["city"]
-        warmest_place = max(date_cities_data_dicts, key = lambda x: x["mean_temp"])["city"]
-        windiest_place = max(date_cities_data_dicts, key = lambda x: x["mean_wind_speed"])["city"]
-
-        # Add summary to the .xml file structure
-        root.append(etree.Element("summary", mean_temp=str(mean_temp), mean_wind_speed=str(mean_wind_speed),
-                                  coldest_place=coldest_place, warmest_place=warmest_place,
-                                  windiest_place=windiest_place))
-
-        # Create .xml file
-        tree = etree.ElementTree(root)
+        date_city_files = [os.path.join(SOURCE_DATA_DIR, c, f"{date}.json") for c in cities]
         file = os.path.join(os.path.dirname(__file__), "tests/example_result.xml")
-        tree.write(file, pretty_print=True)
+        build_xml_file("Spain", date, cities, date_city_files, file, workers, cache)
+
+    if cache is not None:
+        cache.save()
+
+def discover_partitions(source_dir=SOURCE_DATA_DIR):
+    """Finding all (country, date) partitions: source_dir/[country/]city/date.json"""
+    partitions = {}
+    for entry in sorted(os.scandir(source_dir), key=lambda e: e.name):
+        if not entry.is_dir():
+            continue
+
+        # Country dir contains city dirs, city dir contains .json files
+        sub_entries = sorted(os.scandir(entry.path), key=lambda e: e.name)
+        if any(e.is_dir() for e in sub_entries):
+            country, city_dirs = entry.name, [e for e in sub_entries if e.is_dir()]
+        else:
+            country, city_dirs = DEFAULT_COUNTRY, [entry]
+
+        for city_dir in city_dirs:
+            for date_city_file in os.scandir(city_dir.path):
+                if date_city_file.name.endswith(".json"):
+                    date = date_city_file.name.split(".")[0]
+                    partitions.setdefault((country, date), {})[city_dir.name] = date_city_file.path
+    return partitions
+
+def get_inputs_signature(date_city_files):
+    """Getting size and modification time of all input files"""
+    signature = {}
+    for file in date_city_files:
+        stat = os.stat(file)
+        signature[file] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+def build_partition(args):
+    country, date, cities, date_city_files, file, cache_entries = args
+    cache = AggregateCache(entries=cache_entries)
+    return build_xml_file(country, date, cities, date_city_files, file, workers=1, cache=cache), cache.entries
+
+def generate_xml_files(source_dir=SOURCE_DATA_DIR, output_dir=OUTPUT_DIR, workers=None):
+    """Generating one .xml file per (country, date) partition, skipping partitions with unchanged inputs
+
+    In changed partitions only changed .json files are read, statistics of other files are taken from cache.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+
+    cache = AggregateCache(os.path.join(output_dir, CACHE_FILE))
+
+    # Find partitions which need to be generated
+    tasks = []
+    new_manifest = {}
+    source_files = set()
+    for (country, date), city_files in discover_partitions(source_dir).items():
+        source_files.update(city_files.values())
+        name = f"{country}_{date}"
+        file = os.path.join(output_dir, f"{name}.xml")
+        new_manifest[name] = get_inputs_signature(city_files.values())
+        if manifest.get(name) == new_manifest[name] and os.path.exists(file):
+            continue
+        cache_entries = {f: cache.entries[f] for f in city_files.values() if f in cache.entries}
+        tasks.append((country, date, list(city_files), list(city_files.values()), file, cache_entries))
+
+    # Generate partitions in parallel
+    generated_files = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for generated_file, cache_entries in executor.map(build_partition, tasks):
+            generated_files.append(generated_file)
+            cache.entries.update(cache_entries)
+
+    # Keep in cache only files which still exist
+    cache.entries = {f: e for f, e in cache.entries.items() if f in source_files}
+    cache.save()
+    with open(manifest_file, "w") as f:
+        json.dump(new_manifest, f, indent=2)
+    return generated_files
 
 
 if __name__ == "__main__":
-    generate_xml_file()
\ No newline at end of file
+    generate_xml_file()
@@ -0,0 +1,54 @@
+from practice.module_5_additional_topics.parsing_serialization_task.tests.validate_xml import find_violations
+
+VALID_XML = """<weather country="Spain" date="2021-09-25">
+  <cities>
+    <Madrid mean_temp="20.5" max_temp="25" min_temp="15" mean_wind_speed="2.5" max_wind_speed="4" min_wind_speed="1"/>
+    <Palma mean_temp="24.25" max_temp="28" min_temp="21" mean_wind_speed="1.5" max_wind_speed="3" min_wind_speed="0.5"/>
+    <Leon mean_temp="15.75" max_temp="20" min_temp="10" mean_wind_speed="3" max_wind_speed="5" min_wind_speed="1"/>
+  </cities>
+  <summary mean_temp="20.17" mean_wind_speed="2.33" coldest_place="Leon" warmest_place="Palma" windiest_place="Leon"/>
+</weather>
+"""
+
+
+def write_xml(tmp_path, content):
+    path = tmp_path / "result.xml"
+    path.write_text(content)
+    return str(path)
+
+def test_find_violations_valid_file(tmp_path):
+    path = write_xml(tmp_path, VALID_XML)
+    assert find_violations(path, cities_number=3, expected_cities={"Palma": {"mean_temp": 24.25}},
+                           expected_summary={"warmest_place": "Palma"}) == []
+
+def test_find_violations_reports_all_violations(tmp_path):
+    content = (VALID_XML.replace('mean_temp="20.17"', 'mean_temp="21"')
+               .replace('warmest_place="Palma"', 'warmest_place="Madrid"')
+               .replace(' min_wind_speed="0.5"', ''))
+    violations = find_violations(write_xml(tmp_path, content), cities_number=4)
+    assert len(violations) == 4
+    assert any("Invalid attributes in element Palma" in v for v in violations)
+    assert any("Invalid number of cities in XML: 3" in v for v in violations)
+    assert any("Incorrect mean temperature in summary: 21 != 20.17" in v for v in violations)
+    assert any("Incorrect warmest_place in summary: Madrid != Palma" in v for v in violations)
+
+def test_find_violations_malformed_values(tmp_path):
+    # Mean of valid cities only: (20.5 + 15.75) / 2
+    content = (VALID_XML.replace('<Palma mean_temp="24.25"', '<Palma mean_temp="x"')
+               .replace('mean_temp="20.17"', 'mean_temp="18.12"')
+               .replace('warmest_place="Palma"', 'warmest_place="Madrid"'))
+    assert find_violations(write_xml(tmp_path, content)) == ["Invalid mean values in element Palma"]
+
+def test_find_violations_no_valid_city(tmp_path):
+    content = """<weather country="Spain" date="2021-09-25">
+  <cities>
+    <Madrid mean_temp="x" max_temp="25" min_temp="15" mean_wind_speed="2.5" max_wind_speed="4" min_wind_speed="1"/>
+  </cities>
+  <summary mean_temp="20.5" mean_wind_speed="2.5" coldest_place="Madrid" warmest_place="Madrid" windiest_place="Madrid"/>
+</weather>
+"""
+    assert find_violations(write_xml(tmp_path, content)) == ["Invalid mean values in element Madrid"]
+
+def test_find_violations_invalid_xml(tmp_path):
+    violations = find_violations(write_xml(tmp_path, "<weather><cities>"))
+    assert len(violations) == 1 and violations[0].startswith("Invalid XML")
@@ -1,7 +1,12 @@
 from statistics import mean
+from fractions import Fraction
 from lxml import etree
 import os
 
+ROOT_ATTRIBS = {'country', 'date'}
+SUMMARY_ATTRIBS = {'mean_temp', 'mean_wind_speed', 'coldest_place', 'warmest_place', 'windiest_place'}
+CITY_ATTRIBS = {'mean_temp', 'mean_wind_speed', 'min_temp', 'min_wind_speed', 'max_temp', 'max_wind_speed'}
+
 
 def check_result(xml_path: str):
     """Function to check weather XML file for Spain for 2021-09-25"""
@@ -69,5 +74,119 @@ def check_result(xml_path: str):
     print("Success!")
 
 
+def to_float(value):
+    """Converting attribute value to float (None if it is missing or not a number)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def find_violations(xml_path: str, cities_number: int = None, expected_cities: dict = None,
+                    expected_summary: dict = None) -> list:
+    """Function to find all violations in weather XML file in one streaming pass (constant memory)
+
+    Schema and summary invariants are always checked. Number of cities, values of some cities
+    and values of summary are checked only if they are given.
+    """
+    violations = []
+    depth = 0
+    root_children = set()
+    summary = None
+    city_count = 0
+    valid_city_count = 0 # cities with valid mean values
+    # Running aggregates of cities mean values: exact sum, (city, value) of min and max
+    mean_temps_sum = Fraction(0)
+    coldest = warmest = windiest = None
+
+    try:
+        for event, elem in etree.iterparse(xml_path, events=('start', 'end')):
+            if event == 'start':
+                if depth == 0:
+                    if elem.tag != 'weather':
+                        violations.append(f'Invalid root element: {elem.tag}')
+                    if set(elem.attrib.keys()).difference(ROOT_ATTRIBS):
+                        violations.append("No 'country' or 'date' attrib in 'weather' root")
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1:
+                root_children.add(elem.tag)
+                if elem.tag == 'summary':
+                    if set(elem.attrib.keys()) != SUMMARY_ATTRIBS:
+                        violations.append(f'Invalid attributes list in "summary" element: '
+                                          f'{set(elem.attrib.keys()).symmetric_difference(SUMMARY_ATTRIBS)}')
+                    summary = dict(elem.attrib)
+
+            elif depth == 2 and elem.getparent().tag == 'cities':
+                city_count += 1
+                if set(elem.attrib.keys()) != CITY_ATTRIBS:
+                    violations.append(f"Invalid attributes in element {elem.tag}: "
+                                      f"{set(elem.attrib.keys()).symmetric_difference(CITY_ATTRIBS)}")
+                mean_temp = to_float(elem.attrib.get('mean_temp'))
+                mean_wind_speed = to_float(elem.attrib.get('mean_wind_speed'))
+                if mean_temp is None or mean_wind_speed is None:
+                    violations.append(f"Invalid mean values in element {elem.tag}")
+                else:
+                    valid_city_count += 1
+                    mean_temps_sum += Fraction(mean_temp)
+                    # Only strictly better values replace current ones, like in min() and max()
+                    if coldest is None or mean_temp < coldest[1]:
+                        coldest = (elem.tag, mean_temp)
+                    if warmest is None or mean_temp > warmest[1]:
+                        warmest = (elem.tag, mean_temp)
+                    if windiest is None or mean_wind_speed > windiest[1]:
+                        windiest = (elem.tag, mean_wind_speed)
+
+                for attrib, value in (expected_cities or {}).get(elem.tag, {}).items():
+                    if to_float(elem.attrib.get(attrib)) != value:
+                        violations.append(f"Incorrect {attrib} for {elem.tag}: {elem.attrib.get(attrib)} != {value}")
+
+            # Free memory of processed elements
+            if depth >= 1:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        violations.append(f"Invalid XML: {e}")
+        return violations
+
+    if root_children != {'summary', 'cities'}:
+        violations.append(f'Invalid elements in "weather" root: {root_children}')
+    if cities_number is not None and city_count != cities_number:
+        violations.append(f"Invalid number of cities in XML: {city_count}")
+    if summary is None:
+        return violations
+
+    # check results in summary (only cities with valid mean values are aggregated)
+    if valid_city_count:
+        mean_temp = round(float(mean_temps_sum / valid_city_count), 2)
+        if to_float(summary.get('mean_temp')) != mean_temp:
+            violations.append(f"Incorrect mean temperature in summary: {summary.get('mean_temp')} != {mean_temp}")
+    for attrib, aggregate in (('coldest_place', coldest), ('warmest_place', warmest), ('windiest_place', windiest)):
+        if aggregate is not None and summary.get(attrib) != aggregate[0]:
+            violations.append(f"Incorrect {attrib} in summary: {summary.get(attrib)} != {aggregate[0]}")
+    for attrib, value in (expected_summary or {}).items():
+        if summary.get(attrib) != value:
+            violations.append(f"Incorrect {attrib} in summary: {summary.get(attrib)} != {value}")
+
+    return violations
+
+
+def check_result_streaming(xml_path: str):
+    """Function to check weather XML file for Spain for 2021-09-25 in one streaming pass, reporting all violations"""
+    violations = find_violations(
+        xml_path,
+        cities_number=17,
+        expected_cities={'Seville': {'mean_temp': 21.6, 'mean_wind_speed': 1.04, 'min_temp': 17.24,
+                                     'min_wind_speed': 0.45, 'max_temp': 27.13, 'max_wind_speed': 2.24}},
+        expected_summary={'warmest_place': 'Palma', 'coldest_place': 'Valladolid', 'windiest_place': 'Pamplona'},
+    )
+    assert not violations, "\n".join(violations)
+
+    print("Success!")
+
+
 if __name__ == '__main__':
     check_result(xml_path=os.path.join(os.path.dirname(__file__), 'example_result.xml'))
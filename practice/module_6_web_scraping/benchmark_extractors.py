@@ -0,0 +1,101 @@
+"""
+Offline throughput benchmark for Yahoo Finance extractors.
+Pages are read from tests/example_pages, so no network access is needed.
+For every extractor and every available BeautifulSoup parser backend it measures
+pages per second (parsing + extracting) and memory allocations (peak and number of allocated blocks).
+It also compares per-company and batch Blackrock matching of the requests scraper on thousands of holders frames.
+
+Run from repository root:
+    python -m practice.module_6_web_scraping.benchmark_extractors
+"""
+import os
+import random
+import tracemalloc
+from time import perf_counter
+import pandas as pd
+from bs4 import BeautifulSoup, FeatureNotFound
+from practice.module_6_web_scraping.stock_info_requests import collect_data_third_sheet as collect_holders_third_sheet
+from practice.module_6_web_scraping.stock_info_requests import collect_data_third_sheet_batch
+from practice.module_6_web_scraping.stock_info_selenium import (get_info_from_companies_table, collect_data_first_sheet,
+                                                                collect_data_second_sheet, collect_data_third_sheet)
+
+EXAMPLE_PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "example_pages")
+PARSERS = ["html.parser", "lxml", "html5lib"]
+EXTRACTORS = {
+    "get_info_from_companies_table": (
+        "most_active.html", lambda soup: get_info_from_companies_table(soup.find(class_="yf-1uayyp1 bd"))
+    ),
+    "collect_data_first_sheet": ("profile.html", lambda soup: collect_data_first_sheet(soup, {})),
+    "collect_data_second_sheet": ("key_statistics.html", lambda soup: collect_data_second_sheet(soup, {})),
+    "collect_data_third_sheet": ("holders.html", lambda soup: collect_data_third_sheet(soup, {})),
+}
+
+
+def read_page(filename):
+    with open(os.path.join(EXAMPLE_PAGES_DIR, filename), "r", encoding="utf-8") as f:
+        return f.read()
+
+def is_parser_available(parser):
+    try:
+        BeautifulSoup("<html></html>", parser)
+    except FeatureNotFound:
+        return False
+    return True
+
+def benchmark_extractor(html, extractor, parser, repeats=200):
+    """Measuring pages per second and allocations for one extractor and one parser"""
+    time_start = perf_counter()
+    for _ in range(repeats):
+        extractor(BeautifulSoup(html, parser))
+    pages_per_second = repeats / (perf_counter() - time_start)
+
+    tracemalloc.start()
+    extractor(BeautifulSoup(html, parser))
+    snapshot = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    return pages_per_second, peak, blocks
+
+def run_benchmark(repeats=200):
+    results = []
+    for parser in filter(is_parser_available, PARSERS):
+        for name, (filename, extractor) in EXTRACTORS.items():
+            pages_per_second, peak, blocks = benchmark_extractor(read_page(filename), extractor, parser, repeats)
+            results.append({"extractor": name, "parser": parser, "pages/s": round(pages_per_second, 1),
+                            "peak memory": peak, "blocks": blocks})
+    return results
+
+def benchmark_third_sheet_batch(companies=5000, holders_number=10):
+    """Comparing per-company and batch Blackrock matching on synthetic holders frames"""
+    holder_names = ["Vanguard Group Inc", "Blackrock Inc.", "State Street Corporation", "FMR, LLC",
+                    "Geode Capital Management, LLC", "Morgan Stanley", "Capital World Investors",
+                    "Price (T.Rowe) Associates Inc", "Northern Trust Corporation", "Bank of America Corporation"]
+    holders_by_symbol = {
+        f"C{i}": pd.DataFrame({
+            "Holder": random.sample(holder_names, holders_number),
+            "Shares": [random.randint(10**6, 10**9) for _ in range(holders_number)],
+            "Date Reported": [pd.Timestamp("2025-06-30")] * holders_number,
+            "pctHeld": [random.random() / 10 for _ in range(holders_number)],
+            "Value": [random.randint(10**8, 10**11) for _ in range(holders_number)],
+        })
+        for i in range(companies)
+    }
+    names = {sym: f"Company {sym}" for sym in holders_by_symbol}
+
+    time_start = perf_counter()
+    sheet_3 = []
+    for sym, holders in holders_by_symbol.items():
+        collect_holders_third_sheet(sym, names[sym], holders, sheet_3)
+    print(f"Per-company Blackrock matching ({companies} companies) execution time: {perf_counter() - time_start}")
+
+    time_start = perf_counter()
+    collect_data_third_sheet_batch(holders_by_symbol, names, [], row_number=10)
+    print(f"Batch Blackrock matching ({companies} companies) execution time: {perf_counter() - time_start}")
+
+
+if __name__ == "__main__":
+    for result in run_benchmark():
+        print(" | ".join(f"{key}: {value}" for key, value in result.items()))
+    benchmark_third_sheet_batch()
@@ -0,0 +1,75 @@
+"""
+Instrumentation for the stock scrapers.
+Collects per-stage timings (fetch, parse, extract, render) and counters
+(requests, bytes, cache hits, retries, driver restarts) and reports them as JSON.
+Bytes are counted only for responses which scrapers read themselves. Requests made inside
+yfinance (Ticker.info, holders) are counted as unmeasured_requests instead.
+When disabled, stage() returns a shared empty context manager and count() returns at once,
+so instrumented code runs almost as fast as not instrumented one.
+
+Example:
+    >>> metrics = Instrumentation()
+    >>> with metrics.stage("fetch"):
+    ...     metrics.count("requests")
+    >>> metrics.report()["counters"]
+    {'requests': 1}
+"""
+import json
+import math
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+NULL_STAGE = nullcontext()
+
+
+def percentile(sorted_values, q):
+    """Getting percentile (nearest-rank method) from sorted values"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+class Instrumentation:
+    """Timers and counters for scraper stages"""
+    __slots__ = ("enabled", "timings", "counters")
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+
+    def stage(self, name):
+        """Measuring time of one stage run (use with `with` statement)"""
+        if not self.enabled:
+            return NULL_STAGE
+        return self.timed(name)
+
+    @contextmanager
+    def timed(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(name, []).append(perf_counter() - start)
+
+    def count(self, name, n=1):
+        """Increasing counter by n"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self):
+        """Creating report with p50/p95 per stage and all counters"""
+        stages = {}
+        for name, durations in self.timings.items():
+            durations = sorted(durations)
+            stages[name] = {
+                "runs": len(durations),
+                "total": sum(durations),
+                "p50": percentile(durations, 0.5),
+                "p95": percentile(durations, 0.95),
+            }
+        return {"stages": stages, "counters": dict(self.counters)}
+
+    def to_json(self):
+        """Creating JSON report"""
+        return json.dumps(self.report(), indent=2)
@@ -0,0 +1,132 @@
+"""
+Sheet helpers used by the stock scrapers.
+Sheets are lists of per-row dicts: SheetRenderer formats and writes them,
+DedupIndex finds already seen rows.
+
+Example:
+    >>> index = DedupIndex(["Code"])
+    >>> [row["Name"] for row in index.filter([{"Name": "Pfizer Inc.", "Code": "PFE"}, {"Name": "Pfizer", "Code": "PFE"}])]
+    ['Pfizer Inc.']
+"""
+import csv
+import hashlib
+import json
+import numbers
+import sys
+from practice.module_6_web_scraping.snapshot_store import to_json_value
+
+
+class SheetRenderer:
+    """Incremental sheet renderer: formats every cell once and keeps running column widths.
+    Raw row values are kept next to formatted cells for machine-readable output (CSV, JSON lines).
+    """
+    __slots__ = ("title", "columns", "widths", "cells", "values")
+
+    def __init__(self, title, columns):
+        self.title = title
+        self.columns = list(columns)
+        self.widths = [len(col) for col in self.columns]
+        self.cells = []
+        self.values = []
+
+    def add_row(self, row):
+        """Adding one row (dict) and updating column widths"""
+        values = [row.get(col) for col in self.columns]
+        cells = [str(row.get(col, "")) for col in self.columns]
+        self.widths = [max(width, len(cell)) for width, cell in zip(self.widths, cells)]
+        self.cells.append(cells)
+        self.values.append(values)
+
+    def add_rows(self, rows):
+        """Adding many rows (dicts)"""
+        for row in rows:
+            self.add_row(row)
+
+    def lines(self):
+        """Generating table lines"""
+        table_width = sum(self.widths) + 3 * len(self.columns) + 1
+        yield self.title.center(table_width, "=") + "\n"
+        yield self.format_line(self.columns)
+        yield "-" * table_width + "\n"
+        for cells in self.cells:
+            yield self.format_line(cells)
+        yield "\n"
+
+    def format_line(self, cells):
+        """Formatting one table line"""
+        return "| " + " | ".join(cell.ljust(width) for cell, width in zip(cells, self.widths)) + " |\n"
+
+    def write(self, file=None):
+        """Writing table to file-like object (stdout by default)"""
+        file = sys.stdout if file is None else file
+        file.writelines(self.lines())
+
+    def write_csv(self, file):
+        """Writing raw sheet values as CSV (None is written as empty field)"""
+        writer = csv.writer(file)
+        writer.writerow(self.columns)
+        writer.writerows(self.values)
+
+    def write_jsonl(self, file):
+        """Writing raw sheet values as JSON lines (one object per row, None is written as null)"""
+        file.writelines(json.dumps(dict(zip(self.columns, values)), default=to_json_value) + "\n"
+                        for values in self.values)
+
+
+def normalize_value(value):
+    """Converting value to tagged text, equal numbers (1, 1.0, True, numpy 1) get the same text"""
+    # NumPy scalars to Python numbers
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()
+    if isinstance(value, numbers.Real):
+        value = int(value) if float(value).is_integer() else float(value)
+        text = f"n{value!r}"
+    elif isinstance(value, str):
+        text = f"s{value}"
+    elif value is None:
+        text = "z"
+    else:
+        text = f"{type(value).__name__}{value!r}"
+    # Length prefix, so texts of different values can't be glued into the same key
+    return f"{len(text)}:{text}"
+
+
+class DedupIndex:
+    """Index of already seen rows keyed on a subset of columns (optionally by compact hashed keys).
+    Hashed keys are 8-byte blake2b digests: they take less memory, but on a digest collision
+    a distinct row is treated as already seen and dropped (about n**2 / 2**65 chance for n rows).
+    """
+    __slots__ = ("columns", "hashed", "seen")
+
+    def __init__(self, columns, hashed=False):
+        self.columns = list(columns)
+        self.hashed = hashed
+        self.seen = set()
+
+    def __len__(self):
+        return len(self.seen)
+
+    def __contains__(self, row):
+        return self.key(row) in self.seen
+
+    def key(self, row):
+        """Building row key: tuple of column values or 8-byte blake2b digest of normalized values"""
+        key = tuple(row.get(col, "") for col in self.columns)
+        if self.hashed:
+            text = "".join(map(normalize_value, key))
+            key = hashlib.blake2b(text.encode(), digest_size=8).digest()
+        return key
+
+    def add(self, row):
+        """Adding row to index, returns False if row was already seen"""
+        key = self.key(row)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    def filter(self, rows):
+        """Yielding only not seen rows (works with generators)"""
+        for row in rows:
+            if self.add(row):
+                yield row
@@ -0,0 +1,85 @@
+"""
+Local SQLite snapshot store for per-company data of the stock scrapers.
+Every company has one snapshot per field group (profile, statistics, holders) with fetch timestamp.
+A snapshot is stale when it is missing or older than the TTL of its field group,
+so daily runs need to refetch only new companies and outdated field groups.
+
+Example:
+    >>> store = SnapshotStore(":memory:")
+    >>> store.is_stale("PFE", "profile")
+    True
+    >>> store.put("PFE", "profile", {"country": "United States"})
+    >>> store.get("PFE", "profile"), store.is_stale("PFE", "profile")
+    ({'country': 'United States'}, False)
+"""
+import json
+import sqlite3
+from time import time
+
+DAY = 24 * 60 * 60
+SNAPSHOT_FIELDS = {
+    "profile": ["longName", "companyOfficers", "fullTimeEmployees", "country"],
+    "statistics": ["52WeekChange", "totalCash", "marketCap", "heldPercentInstitutions"],
+    "holders": ["Shares", "Date Reported", "% Out", "Value"],
+}
+DEFAULT_TTLS = {"profile": 30 * DAY, "statistics": DAY, "holders": 7 * DAY}
+
+
+def to_json_value(value):
+    """Converting dates and numpy numbers for JSON"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class SnapshotStore:
+    """Snapshots of company field groups with fetch timestamps"""
+
+    def __init__(self, path, ttls=None):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "code TEXT, field_group TEXT, data TEXT, fetched_at REAL, PRIMARY KEY (code, field_group))"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def put(self, code, field_group, data, fetched_at=None):
+        """Saving snapshot of one field group"""
+        fetched_at = time() if fetched_at is None else fetched_at
+        data = {field: data.get(field) for field in SNAPSHOT_FIELDS[field_group]} if data else {}
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                (code, field_group, json.dumps(data, default=to_json_value), fetched_at)
+            )
+
+    def get(self, code, field_group):
+        """Getting snapshot data of one field group (None if there is no snapshot)"""
+        row = self.connection.execute(
+            "SELECT data FROM snapshots WHERE code = ? AND field_group = ?", (code, field_group)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def fetched_at(self, code, field_group):
+        """Getting snapshot fetch timestamp (None if there is no snapshot)"""
+        row = self.connection.execute(
+            "SELECT fetched_at FROM snapshots WHERE code = ? AND field_group = ?", (code, field_group)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def is_stale(self, code, field_group, now=None):
+        """Checking if snapshot is missing or older than field group TTL"""
+        fetched_at = self.fetched_at(code, field_group)
+        now = time() if now is None else now
+        return fetched_at is None or now - fetched_at > self.ttls[field_group]
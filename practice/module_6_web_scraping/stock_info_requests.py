@@ -34,8 +34,18 @@ Links:
 
 BASE_URL = "https://finance.yahoo.com/"
 SEARCH_URL = "https://finance.yahoo.com/markets/stocks/most-active/"
+QUOTE_SUMMARY_URL = "https://query2.finance.yahoo.com/v10/finance/quoteSummary/"
+QUOTE_SUMMARY_MODULES = ["price", "summaryDetail", "assetProfile", "defaultKeyStatistics", "financialData"] # modules needed for sheets
+SNAPSHOT_MODULES = { # quote summary modules needed for every snapshot field group
+    "profile": ["price", "assetProfile"],
+    "statistics": ["price", "defaultKeyStatistics", "financialData"],
+}
 IS_COMPANIES_LIMIT  = False # introduce limit of scraped companies
 COMPANIES_NUMBER_LIMIT = 10 # limit number of scraped companies
+IS_LAZY_HOLDERS = False # fetch holders only for companies which still can get into the third sheet
+IS_INSTRUMENTATION = False # collect per-stage timings and counters and print JSON report
+IS_REFRESH_MODE = False # refetch only new or outdated companies and build sheets from snapshot store
+SNAPSHOT_FILE = "snapshots.sqlite" # snapshot store file next to this script
 
 HEADERS = {
     "User-Agent": (
@@ -45,10 +55,21 @@ HEADERS = {
     )
 }
 
+import os
+import re
 import requests
+import pandas as pd
 from bs4 import BeautifulSoup
 import yfinance as yf
+from yfinance.data import YfData
 from time import time
+import heapq
+from practice.module_6_web_scraping.sheet import SheetRenderer, DedupIndex
+from practice.module_6_web_scraping.instrumentation import Instrumentation
+from practice.module_6_web_scraping.snapshot_store import SnapshotStore
+
+metrics = Instrumentation(enabled=IS_INSTRUMENTATION)
+BLACKROCK_PATTERN = re.compile("blackrock", re.IGNORECASE)
 
 
 def get_info_from_companies_table(companies_table):
@@ -72,6 +93,40 @@ def get_specific_urls(base_url, company_code):
     company_holders_url = f"{base_url}quote/{company_code}/holders"
     return company_profiles_url, company_statistics_url, company_holders_url
 
+def fetch_quote_summary(sym, modules=QUOTE_SUMMARY_MODULES):
+    """Getting only needed quote summary modules for one symbol"""
+    with metrics.stage("fetch"):
+        response = YfData().get(f"{QUOTE_SUMMARY_URL}{sym}",
+                                params={"modules": ",".join(modules), "formatted": "false"})
+        response.raise_for_status()
+    metrics.count("requests")
+    metrics.count("bytes", len(response.content))
+    result = response.json()
+
+    # Flatten modules into one dict (same keys as in yf.Ticker.info)
+    info_dict = {}
+    for module in result["quoteSummary"]["result"][0].values():
+        info_dict.update(module)
+    return info_dict
+
+def fetch_infos(symbols, modules=QUOTE_SUMMARY_MODULES):
+    """Getting info dicts for all symbols: quote summary per symbol, yf.Ticker.info as fallback.
+    Price module gives names and market caps, so no separate batched quote request is needed.
+    """
+    infos = {}
+    for i, sym in enumerate(symbols):
+        print(f"Fetching info for the company {sym} ({i + 1}/{len(symbols)})...")
+        try:
+            info_dict = fetch_quote_summary(sym, modules)
+        except Exception:
+            metrics.count("retries")
+            with metrics.stage("fetch"):
+                info_dict = dict(yf.Ticker(sym).info)
+            metrics.count("info_requests")
+            metrics.count("unmeasured_requests")
+        infos[sym] = info_dict
+    return infos
+
 def collect_data_first_and_second_sheet(sym, info_dict, sheet_1, sheet_2):
     """Collecting data for first sheet and second sheet"""
     # Collect data
@@ -116,24 +171,135 @@ def collect_data_first_and_second_sheet(sym, info_dict, sheet_1, sheet_2):
 def collect_data_third_sheet(sym, name, holders, sheet_3):
     """Collecting data for third sheet"""
     if holders is None or holders.empty:
-        return
+        return None
 
     blackrock = holders[holders['Holder'].str.contains("blackrock", case=False, na=False)]
 
     if blackrock.empty:
-        return
+        return None
 
     row = blackrock.iloc[0]
 
     # Add data
-    sheet_3.append({
+    sheet_row = {
         "Name": name,
         "Code": sym,
         "Shares": row.get("Shares", 0),
         "Date Reported": row.get("Date Reported"),
         "% Out": row.get("pctHeld", 0.0),
         "Value": row.get("Value", 0)
-    })
+    }
+    sheet_3.append(sheet_row)
+    return sheet_row
+
+def collect_data_third_sheet_batch(holders_by_symbol, names, sheet_3, row_number=None):
+    """Collecting data for third sheet from holders of all companies at once"""
+    frames = {sym: holders for sym, holders in holders_by_symbol.items() if holders is not None and not holders.empty}
+    if not frames:
+        return
+
+    # One frame for all companies with company code column
+    holders = pd.concat(frames, names=["Code", None]).reset_index(level=0)
+
+    # First Blackrock row of every company
+    blackrock = holders[holders["Holder"].str.contains(BLACKROCK_PATTERN, na=False)]
+    blackrock = blackrock.groupby("Code", sort=False).head(1)
+
+    # Keep only largest holds
+    if row_number is not None and "Value" in blackrock:
+        blackrock = blackrock.nlargest(row_number, "Value")
+
+    # Add data
+    for row in blackrock.to_dict("records"):
+        sheet_3.append({
+            "Name": names[row["Code"]],
+            "Code": row["Code"],
+            "Shares": row.get("Shares", 0),
+            "Date Reported": row.get("Date Reported"),
+            "% Out": row.get("pctHeld", 0.0),
+            "Value": row.get("Value", 0)
+        })
+
+def fetch_holders(sym):
+    """Getting institutional holders for one symbol"""
+    with metrics.stage("fetch"):
+        holders = yf.Ticker(sym).institutional_holders
+    metrics.count("holders_requests")
+    metrics.count("unmeasured_requests")
+    return holders
+
+def blackrock_value_bound(info_dict):
+    """Getting upper bound of Blackrock holding value from cheap info fields
+    (shares outstanding * institutional % * 52-week high price, infinite if fields are missing)
+    """
+    shares = info_dict.get("sharesOutstanding")
+    high_price = info_dict.get("fiftyTwoWeekHigh")
+    if shares is None or high_price is None:
+        return float("inf")
+    held_percent = info_dict.get("heldPercentInstitutions")
+    # Holdings are reported with some delay, so institutional % is only a soft limit
+    return shares * min(1.0, held_percent if held_percent is not None else 1.0) * high_price
+
+def collect_data_third_sheet_lazy(symbols, names, infos, sheet_3, row_number=10):
+    """Collecting data for third sheet: fetching holders by descending value bound until nobody can beat the top"""
+    ranked_symbols = sorted(symbols, key=lambda sym: blackrock_value_bound(infos[sym]), reverse=True)
+    top_values = [] # min-heap with row_number largest Blackrock values
+
+    for i, sym in enumerate(ranked_symbols):
+        # Stop when remaining companies can't beat current last value in the sheet
+        if len(top_values) == row_number and blackrock_value_bound(infos[sym]) <= top_values[0]:
+            metrics.count("holders_skipped", len(ranked_symbols) - i)
+            break
+
+        holders = fetch_holders(sym)
+        with metrics.stage("extract"):
+            sheet_row = collect_data_third_sheet(sym, names[sym], holders, sheet_3)
+
+        value = sheet_row.get("Value") if sheet_row else None
+        if value is None or value != value:
+            continue
+        if len(top_values) < row_number:
+            heapq.heappush(top_values, value)
+        elif value > top_values[0]:
+            heapq.heapreplace(top_values, value)
+
+def refresh_infos(symbols, store):
+    """Getting info dicts from snapshot store, refetching only new or outdated field groups"""
+    # Group symbols by field groups which need to be refetched
+    symbols_by_groups = {}
+    for sym in symbols:
+        groups = tuple(group for group in SNAPSHOT_MODULES if store.is_stale(sym, group))
+        metrics.count("cache_hits", len(SNAPSHOT_MODULES) - len(groups))
+        if groups:
+            symbols_by_groups.setdefault(groups, []).append(sym)
+    print(f"Companies to refresh: {sum(map(len, symbols_by_groups.values()))}/{len(symbols)}")
+
+    # Update snapshots only of fetched field groups
+    for groups, stale_symbols in symbols_by_groups.items():
+        modules = list(dict.fromkeys(module for group in groups for module in SNAPSHOT_MODULES[group]))
+        for sym, info_dict in fetch_infos(stale_symbols, modules=modules).items():
+            for group in groups:
+                store.put(sym, group, info_dict)
+
+    return {sym: {**store.get(sym, "profile"), **store.get(sym, "statistics")} for sym in symbols}
+
+def refresh_third_sheet(symbols, names, store, sheet_3):
+    """Collecting data for third sheet from snapshot store, refetching only new or outdated holders"""
+    for sym in symbols:
+        # Update snapshot
+        if store.is_stale(sym, "holders"):
+            holders = fetch_holders(sym)
+            with metrics.stage("extract"):
+                store.put(sym, "holders", collect_data_third_sheet(sym, names[sym], holders, []))
+        else:
+            metrics.count("cache_hits")
+
+        # Add data (snapshot is empty when company has no Blackrock holding)
+        holders_dict = store.get(sym, "holders")
+        if holders_dict:
+            if holders_dict["Date Reported"] is not None:
+                holders_dict["Date Reported"] = pd.Timestamp(holders_dict["Date Reported"])
+            sheet_3.append({"Name": names[sym], "Code": sym, **holders_dict})
 
 def collect_data_all_sheets(search_url):
     """Collecting data for all sheets"""
@@ -142,17 +308,22 @@ def collect_data_all_sheets(search_url):
     count = 100
     companies_codes = []
     companies_names = []
+    companies_index = DedupIndex(["Code"])
 
     while True:
         url = f"{search_url}?start={start}&count={count}"
         print(f"Downloading: {url}")
 
-        response = requests.get(url, headers=HEADERS)
+        with metrics.stage("fetch"):
+            response = requests.get(url, headers=HEADERS)
+        metrics.count("requests")
+        metrics.count("bytes", len(response.content))
         if response.status_code != 200:
             break
 
         # Get page source and parse with BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
+        with metrics.stage("parse"):
+            soup = BeautifulSoup(response.text, "html.parser")
 
         # Get table with company details
         companies_table = soup.find(class_="yf-1uayyp1 bd")
@@ -160,13 +331,19 @@ def collect_data_all_sheets(search_url):
             break
 
         # Get info from companies_table
-        page_codes, page_names = get_info_from_companies_table(companies_table)
+        with metrics.stage("extract"):
+            page_codes, page_names = get_info_from_companies_table(companies_table)
         if not page_codes:
             break
 
-        # Collect info from one page
-        companies_codes.extend(page_codes)
-        companies_names.extend(page_names)
+        # Collect info from one page (skip companies already collected from previous pages)
+        companies_number = len(companies_codes)
+        for code, name in zip(page_codes, page_names):
+            if companies_index.add({"Code": code}):
+                companies_codes.append(code)
+                companies_names.append(name)
+        if len(companies_codes) == companies_number:
+            break
         start += count
 
     return companies_codes, companies_names
@@ -188,57 +365,43 @@ def sort_sheet_dict_list(sheet_dict_list, key, reverse=False):
     )
     return sheet_dict_list_sorted
 
+def top_sheet_dict_list(sheet_dict_list, key, k, reverse=False):
+    """Select k top rows without empty values in one pass (works with generators)"""
+    rows = (
+        row for row in sheet_dict_list
+        if (row.get(key) is not None) and (row.get(key) != "")
+    )
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(k, rows, key=lambda row: row[key])
+
+def format_column(sheet_dict_list, column, func):
+    """Format not empty values of column"""
+    for row in sheet_dict_list:
+        if row.get(column) is not None:
+            row[column] = func(row[column])
+
+def fill_missing(sheet_dict_list, value="--"):
+    """Change None to value in all columns"""
+    for row in sheet_dict_list:
+        for key in row.keys():
+            if row[key] is None:
+                row[key] = value
+
 def remove_duplicates(rows, columns):
     """Remove duplicate rows based on specified columns"""
-    seen = set()
-    unique_rows = []
-    for row in rows:
-        row_tuple = tuple(row.get(col, "") for col in columns)
-        if row_tuple not in seen:
-            seen.add(row_tuple)
-            unique_rows.append(row)
-    return unique_rows
-
-def print_sheet(title, columns, rows):
+    return list(DedupIndex(columns).filter(rows))
+
+def print_sheet(title, columns, rows, file=None):
     """Print sheet information"""
     # Remove duplicates
     rows = remove_duplicates(rows, columns)
 
-    # Setting columns widths: max(title, data)
-    col_widths = {}
-    for col in columns:
-        col_widths[col] = max(
-            len(col),
-            max(len(str(row.get(col, ""))) for row in rows)
-        )
-
-    # Setting table width
-    table_width = (
-            sum(col_widths[col] for col in columns)
-            + 3 * len(columns) + 1
-    )
-
-    # Title
-    print(title.center(table_width, "="))
-
-    # Header
-    header = "| " + " | ".join(
-        col.ljust(col_widths[col]) for col in columns
-    ) + " |"
-    print(header)
-
-    # Separator
-    print("-" * table_width)
+    # Format cells and compute columns widths: max(title, data)
+    renderer = SheetRenderer(title, columns)
+    renderer.add_rows(rows)
 
-    # Rows
-    for row in rows:
-        line = "| " + " | ".join(
-            str(row.get(col, "")).ljust(col_widths[col])
-            for col in columns
-        ) + " |"
-        print(line)
-
-    print()
+    # Write title, header, separator and rows at once
+    renderer.write(file)
 
 def get_stock_info():
     # Collect data for all sheets
@@ -256,21 +419,35 @@ def get_stock_info():
     if IS_COMPANIES_LIMIT:
         symbols = symbols[:COMPANIES_NUMBER_LIMIT]
 
+    # Open snapshot store in refresh mode
+    store = None
+    if IS_REFRESH_MODE:
+        store = SnapshotStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), SNAPSHOT_FILE))
+
+    # Getting information for all companies (only needed quote summary modules)
+    infos = refresh_infos(symbols, store) if IS_REFRESH_MODE else fetch_infos(symbols)
+
     # Collect data for all sheets
+    company_names = {}
     for i, sym in enumerate(symbols):
         print(f"Collecting data for the company {sym} ({i + 1}/{len(symbols)})...")
         print(get_specific_urls(BASE_URL, sym))
 
-        # Getting information
-        ticker = yf.Ticker(sym)
-        info_dict = dict(ticker.info)
-
         # Collecting and adding data for sheet 1 and 2
-        name = collect_data_first_and_second_sheet(sym, info_dict, sheet_1, sheet_2)
-
-        # Collecting and adding data for sheet 3
-        holders = ticker.institutional_holders
-        collect_data_third_sheet(sym, name, holders, sheet_3)
+        with metrics.stage("extract"):
+            company_names[sym] = collect_data_first_and_second_sheet(sym, infos[sym], sheet_1, sheet_2)
+
+    # Collecting and adding data for sheet 3
+    if IS_REFRESH_MODE:
+        refresh_third_sheet(symbols, company_names, store, sheet_3)
+        store.close()
+    elif IS_LAZY_HOLDERS:
+        # Only for companies which can get into it
+        collect_data_third_sheet_lazy(symbols, company_names, infos, sheet_3)
+    else:
+        holders_by_symbol = {sym: fetch_holders(sym) for sym in symbols}
+        with metrics.stage("extract"):
+            collect_data_third_sheet_batch(holders_by_symbol, company_names, sheet_3)
 
     # Creating a list of sheets
     sheet_dict_lists = [sheet_1, sheet_2, sheet_3]
@@ -281,46 +458,41 @@ def get_stock_info():
     row_numbers = [5, 10, 10]  # number of companies in each sheet
     sheet_titles = ["5 stocks with most youngest CEOs", "10 stocks with best 52-Week Change",
                     "10 largest holds of Blackrock Inc."]
+    sheet_columns = [
+        ["Name", "Code", "Country", "Employees", "CEO Name", "CEO Year Born"],
+        ["Name", "Code", "52-Week Change", "Total Cash"],
+        ["Name", "Code", "Shares", "Date Reported", "% Out", "Value"],
+    ]
 
-    # Process data and print sheets
+    # Process data: remove empty rows and keep only top rows
     for i, sheet in enumerate(sheet_dict_lists):
-        # Remove empty rows
-        sheet_dict_lists[i] = remove_empty_rows(sheet_dict_lists[i], keys[i])
-        # Sort data
-        sheet_dict_lists[i] = sort_sheet_dict_list(sheet_dict_lists[i], keys[i], reversing[i])
-        # Limit number of rows
-        sheet_dict_lists[i] = sheet_dict_lists[i][0:row_numbers[i]]
+        sheet_dict_lists[i] = top_sheet_dict_list(sheet, keys[i], row_numbers[i], reversing[i])
 
-    # Custom changes to sheets
+    # Custom changes to sheets (only not empty values)
+    format_column(sheet_dict_lists[0], "Employees", lambda v: f"{v:,}")
 
-    # Change None to "--" in missing data
-    for sheet in sheet_dict_lists:
-        for row in sheet:
-            for key in row.keys():
-                if row[key] is None:
-                    row[key] = "--"
-
-    for row in sheet_dict_lists[0]:
-        row["Employees"] = f"{row["Employees"]:,}"
+    format_column(sheet_dict_lists[1], "52-Week Change", lambda v: f"{round(v*100, 2)}%")
+    format_column(sheet_dict_lists[1], "Total Cash", lambda v: f"{v:,}" if isinstance(v, (int, float)) else v)
 
-    for row in sheet_dict_lists[1]:
-        row["52-Week Change"] = f"{round(row["52-Week Change"]*100,2)}%"
-        if isinstance(row.get("Total Cash"), (int, float)): row["Total Cash"] = f"{row['Total Cash']:,}"
+    format_column(sheet_dict_lists[2], "Date Reported", lambda v: v.strftime("%Y-%m-%d"))
+    format_column(sheet_dict_lists[2], "Shares", lambda v: f"{v:,}" if isinstance(v, (int, float)) else v)
+    format_column(sheet_dict_lists[2], "% Out", lambda v: f"{round(v*100, 2)}%")
+    format_column(sheet_dict_lists[2], "Value", lambda v: f"{v:,}")
 
-    for row in sheet_dict_lists[2]:
-        row["Date Reported"] = row["Date Reported"].strftime("%Y-%m-%d")
-        if isinstance(row.get("Shares"), (int, float)): row["Shares"] = f"{row['Shares']:,}"
-        row["% Out"] = f"{round(row["% Out"]*100, 2)}%"
-        row["Value"] = f"{row["Value"]:,}"
-        if isinstance(row.get("Value"), (int, float)): row["Value"] = f"{row['Value']:,}"
+    # Change None to "--" in missing data
+    for sheet in sheet_dict_lists:
+        fill_missing(sheet, "--")
 
     # Print sheets
     for i, sheet in enumerate(sheet_dict_lists):
-        print_sheet(sheet_titles[i], sheet_dict_lists[i][0].keys(), sheet_dict_lists[i])
+        with metrics.stage("render"):
+            print_sheet(sheet_titles[i], sheet_columns[i], sheet)
 
 if __name__ == "__main__":
     start_time = time()
     get_stock_info()
     end_time = time()
     execution_time = end_time - start_time
-    print(f"Function executed in {execution_time:.6f} seconds")
\ No newline at end of file
+    print(f"Function executed in {execution_time:.6f} seconds")
+    if IS_INSTRUMENTATION:
+        print(metrics.to_json())
\ No newline at end of file
@@ -34,6 +34,7 @@ Links:
 
 IS_COMPANIES_LIMIT  = False # introduce limit of scraped companies
 COMPANIES_NUMBER_LIMIT = 10 # limit number of scraped companies
+IS_INSTRUMENTATION = False # collect per-stage timings and counters and print JSON report
 
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -43,6 +44,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from time import sleep, time
 import random
+import heapq
+from practice.module_6_web_scraping.sheet import SheetRenderer, DedupIndex
+from practice.module_6_web_scraping.instrumentation import Instrumentation
+
+metrics = Instrumentation(enabled=IS_INSTRUMENTATION)
 
 def set_web_scraping_urls():
     """Setting up web scraping urls"""
@@ -83,10 +89,18 @@ def accept_cookies(wait):
     except:
         pass
 
+def get_page(driver, url):
+    """Loading page with driver"""
+    with metrics.stage("fetch"):
+        driver.get(url)
+    metrics.count("requests")
+
 def get_beautiful_soup(driver, parser="html.parser"):
     """Getting page source and parse with BeautifulSoup"""
     html = driver.page_source
-    soup = BeautifulSoup(html, parser)
+    metrics.count("bytes", len(html))
+    with metrics.stage("parse"):
+        soup = BeautifulSoup(html, parser)
     return soup
 
 def get_info_from_companies_table(companies_table):
@@ -111,11 +125,12 @@ def collect_data_all_sheets(search_url, driver):
     count = 100
     companies_codes = []
     companies_names = []
+    companies_index = DedupIndex(["Code"])
 
     while True:
         url = f"{search_url}?start={start}&count={count}"
         print(f"Downloading: {url}")
-        driver.get(url)
+        get_page(driver, url)
         # sleep(random.uniform(0.01, 0.03))
 
         # Get page source and parse with BeautifulSoup
@@ -126,12 +141,18 @@ def collect_data_all_sheets(search_url, driver):
         if not companies_table: break
 
         # Get info from companies_table
-        page_codes, page_names = get_info_from_companies_table(companies_table)
+        with metrics.stage("extract"):
+            page_codes, page_names = get_info_from_companies_table(companies_table)
         if not page_codes: break
 
-        # Collect info from one page
-        companies_codes.extend(page_codes)
-        companies_names.extend(page_names)
+        # Collect info from one page (skip companies already collected from previous pages)
+        companies_number = len(companies_codes)
+        for code, name in zip(page_codes, page_names):
+            if companies_index.add({"Code": code}):
+                companies_codes.append(code)
+                companies_names.append(name)
+        if len(companies_codes) == companies_number:
+            break
         start += count
 
     return companies_codes, companies_names
@@ -146,6 +167,7 @@ def get_specific_urls(base_url, companies_codes):
 def restart_driver(driver, start_url, chrome_options):
     """Restarting driver"""
     print("Restarting driver...")
+    metrics.count("driver_restarts")
     driver.quit()
     driver = webdriver.Chrome(options=chrome_options)
     wait = WebDriverWait(driver, 20)
@@ -159,6 +181,7 @@ def restart_driver(driver, start_url, chrome_options):
 def handle_error(driver, start_url, url, chrome_options):
     """Handling too many requests errors"""
     print("Block detected - restarting")
+    metrics.count("retries")
     driver = restart_driver(driver, start_url, chrome_options)
     return driver
 
@@ -245,9 +268,8 @@ def collect_data_third_sheet(soup, third_sheet_dict):
 
     return third_sheet_dict
 
-def collect_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, number_per_session, companies_names, companies_codes):
-    """Collecting data for one sheet"""
-    sheet_dict_list = []
+def iter_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, number_per_session, companies_names, companies_codes):
+    """Collecting data for one sheet row by row"""
     for i, url in enumerate(urls):
         print(f"Collecting data for the {sheet_tag} sheet. Company {i + 1}/{len(urls)}")
         print(url)
@@ -255,10 +277,10 @@ def collect_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, n
         if i > 0 and i % number_per_session == 0:
             print("Restarting driver to avoid MaxRetryError...")
             driver = restart_driver(driver, start_url, chrome_options)
-            driver.get(url)
+            get_page(driver, url)
 
         sheet_dict = {}
-        driver.get(url)
+        get_page(driver, url)
 
         sheet_dict["Name"] = companies_names[i]
         sheet_dict["Code"] = companies_codes[i]
@@ -267,23 +289,27 @@ def collect_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, n
         current_url = driver.current_url.lower()
         if "404" in current_url and "err" in current_url:
             driver = handle_error(driver, start_url, url, chrome_options)
-            driver.get(url)
+            get_page(driver, url)
 
         # Parsing html with Beautiful Soup
         soup = get_beautiful_soup(driver, "html.parser")
 
         # Choosing web scraping pattern
-        match sheet_tag:
-            case "first":
-                sheet_dict = collect_data_first_sheet(soup, sheet_dict)
-            case "second":
-                sheet_dict = collect_data_second_sheet(soup, sheet_dict)
-            case "third":
-                sheet_dict = collect_data_third_sheet(soup, sheet_dict)
+        with metrics.stage("extract"):
+            match sheet_tag:
+                case "first":
+                    sheet_dict = collect_data_first_sheet(soup, sheet_dict)
+                case "second":
+                    sheet_dict = collect_data_second_sheet(soup, sheet_dict)
+                case "third":
+                    sheet_dict = collect_data_third_sheet(soup, sheet_dict)
 
-        sheet_dict_list.append(sheet_dict)
+        yield sheet_dict
 
-    return sheet_dict_list
+def collect_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, number_per_session, companies_names, companies_codes):
+    """Collecting data for one sheet"""
+    return list(iter_data_for_sheet(sheet_tag, urls, start_url, driver, chrome_options, number_per_session,
+                                    companies_names, companies_codes))
 
 def remove_empty_rows(sheet_dict_list, key):
     """Remove empty rows for sorting"""
@@ -302,57 +328,33 @@ def sort_sheet_dict_list(sheet_dict_list, key, reverse=False):
     )
     return sheet_dict_list_sorted
 
+def top_sheet_dict_list(sheet_dict_list, key, k, reverse=False):
+    """Select k top rows without empty values in one pass (works with generators)"""
+    rows = (row for row in sheet_dict_list if row.get(key) is not None)
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(k, rows, key=lambda row: row[key])
+
+def format_column(sheet_dict_list, column, func):
+    """Format not empty values of column"""
+    for row in sheet_dict_list:
+        if row.get(column) is not None:
+            row[column] = func(row[column])
+
 def remove_duplicates(rows, columns):
     """Remove duplicate rows based on specified columns"""
-    seen = set()
-    unique_rows = []
-    for row in rows:
-        row_tuple = tuple(row.get(col, "") for col in columns)
-        if row_tuple not in seen:
-            seen.add(row_tuple)
-            unique_rows.append(row)
-    return unique_rows
-
-def print_sheet(title, columns, rows):
+    return list(DedupIndex(columns).filter(rows))
+
+def print_sheet(title, columns, rows, file=None):
     """Print sheet information"""
     # Remove duplicates
     rows = remove_duplicates(rows, columns)
 
-    # Setting columns widths: max(title, data)
-    col_widths = {}
-    for col in columns:
-        col_widths[col] = max(
-            len(col),
-            max(len(str(row.get(col, ""))) for row in rows)
-        )
-
-    # Setting table width
-    table_width = (
-            sum(col_widths[col] for col in columns)
-            + 3 * len(columns) + 1
-    )
-
-    # Title
-    print(title.center(table_width, "="))
-
-    # Header
-    header = "| " + " | ".join(
-        col.ljust(col_widths[col]) for col in columns
-    ) + " |"
-    print(header)
-
-    # Separator
-    print("-" * table_width)
+    # Format cells and compute columns widths: max(title, data)
+    renderer = SheetRenderer(title, columns)
+    renderer.add_rows(rows)
 
-    # Rows
-    for row in rows:
-        line = "| " + " | ".join(
-            str(row.get(col, "")).ljust(col_widths[col])
-            for col in columns
-        ) + " |"
-        print(line)
-
-    print()
+    # Write title, header, separator and rows at once
+    renderer.write(file)
 
 def get_stock_info():
 
@@ -394,47 +396,38 @@ def get_stock_info():
     companies_number_limit = COMPANIES_NUMBER_LIMIT # limit number of scraped companies
     number_per_session = 160 # limit number of companies per session
 
-    # Collect data from dynamically created html for all sheets
+    # Collect data from dynamically created html for all sheets and keep only top rows
     if companies_number_limit_bool:
         for i, sheet in enumerate(sheet_dict_lists):
             # Restart session
             driver = restart_driver(driver, start_url, chrome_options)
             # Collect data
-            sheet_dict_lists[i] = collect_data_for_sheet(sheet_tags[i], sheet_urls[i][0:companies_number_limit], start_url, driver, chrome_options, number_per_session, companies_names, companies_codes)
+            rows = iter_data_for_sheet(sheet_tags[i], sheet_urls[i][0:companies_number_limit], start_url, driver, chrome_options, number_per_session, companies_names, companies_codes)
+            sheet_dict_lists[i] = top_sheet_dict_list(rows, keys[i], row_numbers[i], reversing[i])
     else:
         for i, sheet in enumerate(sheet_dict_lists):
             # Restart session
             driver = restart_driver(driver, start_url, chrome_options)
-            sheet_dict_lists[i] = collect_data_for_sheet(sheet_tags[i], sheet_urls[i], start_url, driver, chrome_options, number_per_session, companies_names, companies_codes)
+            rows = iter_data_for_sheet(sheet_tags[i], sheet_urls[i], start_url, driver, chrome_options, number_per_session, companies_names, companies_codes)
+            sheet_dict_lists[i] = top_sheet_dict_list(rows, keys[i], row_numbers[i], reversing[i])
 
     driver.quit()
 
-    # Process data and print sheets
-    for i, sheet in enumerate(sheet_dict_lists):
-        # Remove empty rows
-        sheet_dict_lists[i] = remove_empty_rows(sheet_dict_lists[i], keys[i])
-        # Sort data
-        sheet_dict_lists[i] = sort_sheet_dict_list(sheet_dict_lists[i], keys[i], reversing[i])
-        # Limit number of rows
-        sheet_dict_lists[i] = sheet_dict_lists[i][0:row_numbers[i]]
-
-    # Custom changes to sheets
-    for row in sheet_dict_lists[0]:
-        row["Employees"] = f"{row["Employees"]:,}"
-
-    for row in sheet_dict_lists[1]:
-        row["52-Week Change"] = f"{row["52-Week Change"]}%"
-
-    for row in sheet_dict_lists[2]:
-        row["Value"] = f"{row["Value"]:,}"
+    # Custom changes to sheets (only not empty values)
+    format_column(sheet_dict_lists[0], "Employees", lambda v: f"{v:,}")
+    format_column(sheet_dict_lists[1], "52-Week Change", lambda v: f"{v}%")
+    format_column(sheet_dict_lists[2], "Value", lambda v: f"{v:,}")
 
     # Print sheets
     for i, sheet in enumerate(sheet_dict_lists):
-        print_sheet(sheet_titles[i], sheet_dict_lists[i][0].keys(), sheet_dict_lists[i])
+        with metrics.stage("render"):
+            print_sheet(sheet_titles[i], sheet[0].keys() if sheet else [], sheet)
 
 if __name__ == "__main__":
     start_time = time()
     get_stock_info()
     end_time = time()
     execution_time = end_time - start_time
-    print(f"Function executed in {execution_time:.6f} seconds")
\ No newline at end of file
+    print(f"Function executed in {execution_time:.6f} seconds")
+    if IS_INSTRUMENTATION:
+        print(metrics.to_json())
\ No newline at end of file
@@ -0,0 +1,32 @@
+import pandas as pd
+from practice.module_6_web_scraping.stock_info_requests import collect_data_third_sheet, collect_data_third_sheet_batch
+
+def create_holders(holder_names, values):
+    return pd.DataFrame({"Holder": holder_names, "Shares": values, "Date Reported": [None] * len(values),
+                         "pctHeld": [0.01] * len(values), "Value": values})
+
+def test_collect_data_third_sheet_batch():
+    holders_by_symbol = {
+        "A": create_holders(["Vanguard Group Inc", "Blackrock Inc.", "BlackRock Fund"], [10, 5, 7]),
+        "B": create_holders(["Vanguard Group Inc"], [3]),
+        "C": create_holders(["BLACKROCK INC."], [8]),
+        "D": None,
+    }
+    names = {sym: f"Company {sym}" for sym in holders_by_symbol}
+    sheet_3, expected_sheet_3 = [], []
+
+    collect_data_third_sheet_batch(holders_by_symbol, names, sheet_3)
+    for sym, holders in holders_by_symbol.items():
+        collect_data_third_sheet(sym, names[sym], holders, expected_sheet_3)
+
+    assert sheet_3 == expected_sheet_3
+    assert [row["Value"] for row in sheet_3] == [5, 8]
+
+def test_collect_data_third_sheet_batch_largest():
+    holders_by_symbol = {sym: create_holders(["Blackrock Inc."], [value]) for sym, value in zip("ABCD", [4, 9, 1, 6])}
+    names = {sym: f"Company {sym}" for sym in holders_by_symbol}
+    sheet_3 = []
+
+    collect_data_third_sheet_batch(holders_by_symbol, names, sheet_3, row_number=2)
+
+    assert [row["Code"] for row in sheet_3] == ["B", "D"]
@@ -0,0 +1,26 @@
+import pandas as pd
+from unittest.mock import patch
+import practice.module_6_web_scraping.stock_info_requests as mod
+
+def fake_holders(sym):
+    values = {"A": 500, "B": 300, "C": 900, "D": 10}
+    return pd.DataFrame({"Holder": ["Vanguard Group Inc", "Blackrock Inc."], "Shares": [1, 2],
+                         "Date Reported": [None, None], "pctHeld": [0.1, 0.05], "Value": [1000, values[sym]]})
+
+def test_collect_data_third_sheet_lazy():
+    infos = {
+        "A": {"sharesOutstanding": 100, "fiftyTwoWeekHigh": 100, "heldPercentInstitutions": 0.7},
+        "B": {"sharesOutstanding": 40, "fiftyTwoWeekHigh": 100, "heldPercentInstitutions": 0.5},
+        "C": {"sharesOutstanding": None, "fiftyTwoWeekHigh": 100},
+        "D": {"sharesOutstanding": 1, "fiftyTwoWeekHigh": 100, "heldPercentInstitutions": 0.5},
+    }
+    names = {sym: f"Company {sym}" for sym in infos}
+    sheet_3 = []
+
+    with patch.object(mod, "fetch_holders", side_effect=fake_holders) as fetch_holders:
+        mod.collect_data_third_sheet_lazy(list(infos), names, infos, sheet_3, row_number=2)
+
+    # C (unknown bound) and A go first, B (bound 2000) still can beat 500, D (bound 50) can not
+    assert [call.args[0] for call in fetch_holders.call_args_list] == ["C", "A", "B"]
+    assert [row["Code"] for row in sheet_3] == ["C", "A", "B"]
+    assert sheet_3[0]["Value"] == 900
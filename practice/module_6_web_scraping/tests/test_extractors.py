@@ -0,0 +1,42 @@
+import os
+import pytest
+from bs4 import BeautifulSoup
+from practice.module_6_web_scraping.stock_info_selenium import (get_info_from_companies_table, collect_data_first_sheet,
+                                                                collect_data_second_sheet, collect_data_third_sheet)
+
+EXAMPLE_PAGES_DIR = os.path.join(os.path.dirname(__file__), "example_pages")
+
+def read_page(filename):
+    with open(os.path.join(EXAMPLE_PAGES_DIR, filename), "r", encoding="utf-8") as f:
+        return BeautifulSoup(f.read(), "html.parser")
+
+def test_get_info_from_companies_table():
+    companies_table = read_page("most_active.html").find(class_="yf-1uayyp1 bd")
+
+    page_codes, page_names = get_info_from_companies_table(companies_table)
+
+    assert page_codes == ["NVDA", "PFE", "F"]
+    assert page_names == ["NVIDIA Corporation", "Pfizer Inc.", "Ford Motor Company"]
+
+def test_collect_data_first_sheet():
+    sheet_dict = collect_data_first_sheet(read_page("profile.html"), {})
+
+    assert sheet_dict == {
+        "CEO Name": "Dr. Albert Bourla D.V.M., DVM, Ph.D.",
+        "CEO Year Born": 1962,
+        "Employees": 81000,
+        "Country": "United States",
+    }
+
+def test_collect_data_second_sheet():
+    sheet_dict = collect_data_second_sheet(read_page("key_statistics.html"), {})
+
+    assert sheet_dict == {"Total Cash": "11.74B", "52-Week Change": -8.07}
+
+@pytest.mark.parametrize("filename, expected", [
+    ("holders.html", {"Shares": "455,012,963", "Date Reported": "Jun 30, 2025", "% Out": "8.00%",
+                      "Value": 11152367723}),
+    ("holders_without_blackrock.html", {"Shares": "", "Date Reported": "", "% Out": "", "Value": None})
+])
+def test_collect_data_third_sheet(filename, expected):
+    assert collect_data_third_sheet(read_page(filename), {}) == expected
@@ -0,0 +1,54 @@
+from unittest.mock import patch, Mock
+import practice.module_6_web_scraping.stock_info_requests as mod
+from practice.module_6_web_scraping.instrumentation import Instrumentation
+
+def fake_quote_summary(sym, modules=None):
+    if sym == "BAD":
+        raise KeyError("result")
+    return {"country": "United States", "52WeekChange": 0.1}
+
+def test_fetch_infos_with_fallback():
+    ticker = Mock(return_value=Mock(info={"longName": "Fallback Inc."}))
+
+    with patch.object(mod, "fetch_quote_summary", side_effect=fake_quote_summary) as quote_summary, \
+            patch.object(mod.yf, "Ticker", ticker):
+        infos = mod.fetch_infos(["A", "B", "BAD"])
+
+    assert quote_summary.call_count == 3
+    assert infos["A"] == {"country": "United States", "52WeekChange": 0.1}
+    assert infos["BAD"] == {"longName": "Fallback Inc."}
+    ticker.assert_called_once_with("BAD")
+
+def test_fetch_infos_requests_only_given_modules():
+    quote_summary = Mock(return_value={"longName": "A Inc.", "marketCap": 1000})
+
+    with patch.object(mod, "fetch_quote_summary", quote_summary):
+        infos = mod.fetch_infos(["A"], modules=["price"])
+
+    quote_summary.assert_called_once_with("A", ["price"])
+    assert infos["A"] == {"longName": "A Inc.", "marketCap": 1000}
+
+def test_fetch_quote_summary_requests_price_module():
+    result = {"quoteSummary": {"result": [{"price": {"longName": "A Inc.", "marketCap": 1000},
+                                           "assetProfile": {"country": "United States"}}]}}
+    response = Mock(content=b"x" * 120, json=Mock(return_value=result))
+    yf_data = Mock(return_value=Mock(get=Mock(return_value=response)))
+    metrics = Instrumentation()
+
+    with patch.object(mod, "YfData", yf_data), patch.object(mod, "metrics", metrics):
+        info_dict = mod.fetch_quote_summary("A")
+
+    params = yf_data.return_value.get.call_args.kwargs["params"]
+    assert "price" in params["modules"].split(",")
+    assert info_dict == {"longName": "A Inc.", "marketCap": 1000, "country": "United States"}
+    assert metrics.counters == {"requests": 1, "bytes": 120}
+
+def test_fetch_infos_counts_fallback_as_unmeasured():
+    ticker = Mock(return_value=Mock(info={"longName": "Fallback Inc."}))
+    metrics = Instrumentation()
+
+    with patch.object(mod, "fetch_quote_summary", side_effect=KeyError("result")), \
+            patch.object(mod.yf, "Ticker", ticker), patch.object(mod, "metrics", metrics):
+        mod.fetch_infos(["BAD"])
+
+    assert metrics.counters == {"retries": 1, "info_requests": 1, "unmeasured_requests": 1}
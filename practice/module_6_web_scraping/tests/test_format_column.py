@@ -0,0 +1,14 @@
+from practice.module_6_web_scraping.stock_info_requests import format_column, fill_missing
+
+def test_format_column_and_fill_missing():
+    data = [
+        {"Name": "Company A", "Value": 5000},
+        {"Name": "Company B", "Value": None},
+        {"Name": None, "Value": 12}
+    ]
+
+    format_column(data, "Value", lambda v: f"{v:,}")
+    fill_missing(data, "--")
+
+    assert [row["Value"] for row in data] == ["5,000", "--", "12"]
+    assert data[2]["Name"] == "--"
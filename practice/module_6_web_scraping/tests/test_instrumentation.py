@@ -0,0 +1,23 @@
+import json
+from practice.module_6_web_scraping.instrumentation import Instrumentation, NULL_STAGE
+
+def test_instrumentation_report():
+    metrics = Instrumentation()
+    for _ in range(3):
+        with metrics.stage("fetch"):
+            metrics.count("requests")
+    metrics.count("bytes", 100)
+
+    report = json.loads(metrics.to_json())
+
+    assert report["counters"] == {"requests": 3, "bytes": 100}
+    assert report["stages"]["fetch"]["runs"] == 3
+    assert report["stages"]["fetch"]["p50"] <= report["stages"]["fetch"]["p95"]
+
+def test_instrumentation_disabled():
+    metrics = Instrumentation(enabled=False)
+    with metrics.stage("fetch"):
+        metrics.count("requests")
+
+    assert metrics.stage("fetch") is NULL_STAGE
+    assert metrics.report() == {"stages": {}, "counters": {}}
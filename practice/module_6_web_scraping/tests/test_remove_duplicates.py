@@ -0,0 +1,33 @@
+import numpy as np
+from practice.module_6_web_scraping.sheet import DedupIndex
+from practice.module_6_web_scraping.stock_info_requests import remove_duplicates
+
+def test_remove_duplicates():
+    rows = [
+        {"Name": "Company A", "Code": "A"},
+        {"Name": "Company A", "Code": "A"},
+        {"Name": "Company A", "Code": "AA"}
+    ]
+
+    assert remove_duplicates(rows, ["Name", "Code"]) == [rows[0], rows[2]]
+    assert remove_duplicates(rows, ["Name"]) == [rows[0]]
+
+def test_dedup_index_hashed_stream():
+    index = DedupIndex(["Code"], hashed=True)
+    rows = ({"Code": code} for code in ["A", "B", "A", "C", "B"])
+
+    unique_rows = list(index.filter(rows))
+
+    assert [row["Code"] for row in unique_rows] == ["A", "B", "C"]
+    assert len(index) == 3
+    assert {"Code": "C"} in index
+    assert all(isinstance(key, bytes) and len(key) == 8 for key in index.seen)
+
+def test_dedup_index_hashed_matches_tuple_keys():
+    rows = [{"Code": "A", "Value": v} for v in [1, 1.0, np.int64(1), np.float64(1.0), 1.5, np.float64(1.5), None, "1"]]
+
+    unique_rows = list(DedupIndex(["Code", "Value"]).filter(rows))
+    unique_hashed_rows = list(DedupIndex(["Code", "Value"], hashed=True).filter(rows))
+
+    assert unique_hashed_rows == unique_rows
+    assert [row["Value"] for row in unique_hashed_rows] == [1, 1.5, None, "1"]
@@ -0,0 +1,61 @@
+import io
+import datetime
+from practice.module_6_web_scraping.sheet import SheetRenderer
+
+def create_renderer():
+    renderer = SheetRenderer("Sheet", ["Name", "Code"])
+    renderer.add_row({"Name": "Pfizer Inc.", "Code": "PFE"})
+    renderer.add_row({"Name": "Apple", "Code": None})
+    return renderer
+
+def create_numeric_renderer():
+    renderer = SheetRenderer("Sheet", ["Code", "Value", "Date Reported"])
+    renderer.add_row({"Code": "PFE", "Value": 1234567, "Date Reported": datetime.date(2025, 6, 30)})
+    renderer.add_row({"Code": "AAPL", "Value": None, "Date Reported": None})
+    return renderer
+
+def test_sheet_renderer_write():
+    output = io.StringIO()
+
+    create_renderer().write(output)
+
+    expected = (
+        "========Sheet=========\n"
+        "| Name        | Code |\n"
+        "----------------------\n"
+        "| Pfizer Inc. | PFE  |\n"
+        "| Apple       | None |\n\n"
+    )
+    assert output.getvalue() == expected
+
+def test_sheet_renderer_empty():
+    output = io.StringIO()
+
+    SheetRenderer("Sheet", ["Name"]).write(output)
+
+    assert output.getvalue() == "=Sheet==\n| Name |\n--------\n\n"
+
+def test_sheet_renderer_csv_jsonl():
+    renderer = create_renderer()
+    csv_output = io.StringIO()
+    jsonl_output = io.StringIO()
+
+    renderer.write_csv(csv_output)
+    renderer.write_jsonl(jsonl_output)
+
+    assert csv_output.getvalue() == "Name,Code\r\nPfizer Inc.,PFE\r\nApple,\r\n"
+    assert jsonl_output.getvalue() == '{"Name": "Pfizer Inc.", "Code": "PFE"}\n{"Name": "Apple", "Code": null}\n'
+
+def test_sheet_renderer_raw_values():
+    renderer = create_numeric_renderer()
+    csv_output = io.StringIO()
+    jsonl_output = io.StringIO()
+
+    renderer.write_csv(csv_output)
+    renderer.write_jsonl(jsonl_output)
+
+    assert csv_output.getvalue() == "Code,Value,Date Reported\r\nPFE,1234567,2025-06-30\r\nAAPL,,\r\n"
+    assert jsonl_output.getvalue() == (
+        '{"Code": "PFE", "Value": 1234567, "Date Reported": "2025-06-30"}\n'
+        '{"Code": "AAPL", "Value": null, "Date Reported": null}\n'
+    )
@@ -0,0 +1,53 @@
+import datetime
+from unittest.mock import patch
+import practice.module_6_web_scraping.stock_info_requests as mod
+from practice.module_6_web_scraping.snapshot_store import SnapshotStore, DAY
+
+def test_snapshot_store_ttl(tmp_path):
+    with SnapshotStore(str(tmp_path / "snapshots.sqlite")) as store:
+        store.put("PFE", "holders", {"Shares": 10, "Date Reported": datetime.date(2025, 6, 30), "Other": 1},
+                  fetched_at=0)
+        store.put("F", "holders", None, fetched_at=0)
+
+        assert store.get("PFE", "holders") == {"Shares": 10, "Date Reported": "2025-06-30", "% Out": None,
+                                               "Value": None}
+        assert store.get("F", "holders") == {}
+        assert store.get("NVDA", "holders") is None
+        assert not store.is_stale("PFE", "holders", now=6 * DAY)
+        assert store.is_stale("PFE", "holders", now=8 * DAY)
+        assert store.is_stale("NVDA", "holders", now=0)
+
+def test_refresh_infos(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite"))
+    store.put("PFE", "profile", {"longName": "Pfizer Inc."})
+    store.put("PFE", "statistics", {"marketCap": 100})
+    fetched = {"F": {"longName": "Ford Motor Company", "marketCap": 50, "symbol": "F"}}
+
+    with patch.object(mod, "fetch_infos", return_value=fetched) as fetch_infos:
+        infos = mod.refresh_infos(["PFE", "F"], store)
+
+    fetch_infos.assert_called_once_with(["F"], modules=["price", "assetProfile", "defaultKeyStatistics",
+                                                         "financialData"])
+    assert infos["PFE"]["longName"] == "Pfizer Inc."
+    assert infos["F"]["longName"] == "Ford Motor Company"
+    assert infos["F"]["marketCap"] == 50
+    assert "symbol" not in infos["F"]
+    store.close()
+
+def test_refresh_infos_only_stale_groups(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite"))
+    store.put("PFE", "profile", {"longName": "Pfizer Inc."}, fetched_at=0)
+    store.put("PFE", "statistics", {"marketCap": 100}, fetched_at=0)
+    store.ttls["profile"] = float("inf")
+    fetched = {"PFE": {"longName": "Pfizer", "marketCap": 200}}
+
+    with patch.object(mod, "fetch_infos", return_value=fetched) as fetch_infos:
+        infos = mod.refresh_infos(["PFE"], store)
+
+    # Only statistics are outdated: profile is neither requested nor updated
+    fetch_infos.assert_called_once_with(["PFE"], modules=["price", "defaultKeyStatistics", "financialData"])
+    assert infos["PFE"]["longName"] == "Pfizer Inc."
+    assert infos["PFE"]["marketCap"] == 200
+    assert store.fetched_at("PFE", "profile") == 0
+    assert store.fetched_at("PFE", "statistics") > 0
+    store.close()
@@ -0,0 +1,22 @@
+from practice.module_6_web_scraping.stock_info_requests import top_sheet_dict_list, sort_sheet_dict_list, remove_empty_rows
+
+def test_top_sheet_dict_list():
+    data = [
+        {"week_change": 5.2, "Name": "Company A"},
+        {"week_change": None, "Name": "Company B"},
+        {"week_change": 12.3, "Name": "Company C"},
+        {"week_change": "", "Name": "Company D"},
+        {"week_change": 3.1, "Name": "Company E"}
+    ]
+
+    top_data = top_sheet_dict_list(data, "week_change", 2, reverse=True)
+
+    assert [row["Name"] for row in top_data] == ["Company C", "Company A"]
+    assert top_data == sort_sheet_dict_list(remove_empty_rows(data, "week_change"), "week_change", True)[:2]
+
+def test_top_sheet_dict_list_generator():
+    rows = ({"Value": v, "Name": f"Company {v}"} for v in [7, 1, None, 4, 9])
+
+    top_data = top_sheet_dict_list(rows, "Value", 3)
+
+    assert [row["Value"] for row in top_data] == [1, 4, 7]